@@ -14,6 +14,7 @@ based on provided summaries and key points.
   - Target audience
   - SEO keywords
 - Formats output with clear section separation
+- Can stream the idea, returning each section as soon as it is complete
 
 ## Dependencies
 
@@ -56,6 +57,11 @@ generateidea(input)
 - Returns: Formatted string containing structured content idea
 - Error Returns: Error message if generation fails
 
+stream_idea(input)
+- Same as generateidea, streaming: yields the formatted idea so far each time a
+  section is complete
+- Uses the shared client from llm_client.py instead of creating one per call
+
 ## Returns
 Structured string containing:
 1. Title
@@ -75,35 +81,49 @@ Structured string containing:
 """
 
 
-from langchain_google_genai import ChatGoogleGenerativeAI
+import re
 from langchain_community.tools.tavily_search import TavilySearchResults
 from dotenv import load_dotenv, find_dotenv
 import os
 from langchain.agents import initialize_agent
 from langchain_community.agent_toolkits.load_tools import load_tools
+from llm_client import GEMINI_MODEL, get_llm, predict, stream, parse_sections
 
 # Load environment variables
 load_dotenv(find_dotenv('keys1.env'))
 
-# Set the model name and API keys
-GEMINI_MODEL = "gemini-1.5-flash"
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+# Set the API keys
 os.environ["TAVILY_API_KEY"] = os.getenv("TAVILY_API_KEY")
 
-def generateidea(input):
-    """Generate content ideas based on summary and key points."""
-    try:
-        # Initialize the model with higher temperature for creativity
-        llm = ChatGoogleGenerativeAI(
-            google_api_key=GEMINI_API_KEY,
-            model=GEMINI_MODEL,
-            temperature=0.7,
-            top_p=0.9,
-            max_output_tokens=2048  # Ensure longer output
-        )
-        
-        # Create a specific prompt template
-        prompt = f"""
+# Numbered idea sections, anchored on the exact titles from the prompt so that a
+# numbered bold list inside a section does not start a new one. Headers stay in the text.
+IDEA_TITLES = [
+    "Title",
+    "Description/Hook",
+    "Main Talking Points",
+    "Suggested Video Structure",
+    "Potential Thumbnail Concepts",
+    "Target Audience",
+    "Estimated Video Length",
+    "Keywords for SEO",
+]
+IDEA_SECTIONS = {
+    number: re.compile(rf"\s*(?={number}\.\s*\*\*{re.escape(title)})", re.IGNORECASE)
+    for number, title in enumerate(IDEA_TITLES, start=1)
+}
+
+def get_idea_llm():
+    """Returns the shared model client, with higher temperature for creativity."""
+    return get_llm(
+        GEMINI_MODEL,
+        temperature=0.7,
+        top_p=0.9,
+        max_output_tokens=2048  # Ensure longer output
+    )
+
+def build_idea_prompt(input):
+    """Creates the content idea prompt for a summary and its key points."""
+    return f"""
         Based on this content:
         Summary: {input["summary"]}
         Key Points: {input["keypoints"]}
@@ -148,22 +168,43 @@ def generateidea(input):
         Ensure each section is detailed and properly formatted.
         """
 
+def parse_idea(chunks):
+    """
+    Splits an idea response into its numbered sections, keeping any text before the first.
+    Args:
+        chunks (iterable): Response text in pieces, e.g. from stream().
+    Yields:
+        str: Each section's text, as soon as it is complete.
+    """
+    for _, text in parse_sections(chunks, IDEA_SECTIONS, preamble="preamble"):
+        yield text
+
+def format_idea(response):
+    """Puts a blank line between the numbered sections of a whole response."""
+    return "\n\n".join(parse_idea([response]))
+
+def generateidea(input):
+    """Generate content ideas based on summary and key points."""
+    try:
         # Generate response directly with LLM
-        response = llm.predict(prompt)
-        
-        # Format the response
-        formatted_response = response.replace("1. **", "\n\n1. **")
-        formatted_response = formatted_response.replace("2. **", "\n\n2. **")
-        formatted_response = formatted_response.replace("3. **", "\n\n3. **")
-        formatted_response = formatted_response.replace("4. **", "\n\n4. **")
-        formatted_response = formatted_response.replace("5. **", "\n\n5. **")
-        formatted_response = formatted_response.replace("6. **", "\n\n6. **")
-        formatted_response = formatted_response.replace("7. **", "\n\n7. **")
-        formatted_response = formatted_response.replace("8. **", "\n\n8. **")
-        
-        return formatted_response.strip()
+        response = predict(get_idea_llm(), build_idea_prompt(input))
+        return format_idea(response)
 
     except Exception as e:
         return f"Error generating content idea: {str(e)}"
 
+def stream_idea(input):
+    """
+    Generate content ideas, yielding the formatted idea each time a section is complete.
+    """
+    try:
+        sections = []
+        for text in parse_idea(stream(get_idea_llm(), build_idea_prompt(input))):
+            sections.append(text)
+            yield "\n\n".join(sections)
 
+        if not sections:
+            yield "Error generating content idea: No response generated."
+
+    except Exception as e:
+        yield f"Error generating content idea: {str(e)}"
@@ -10,6 +10,7 @@ integrating video fetching, transcription, summarization, and content idea gener
 - Coordinates video fetching and transcription
 - Generates summaries and content ideas
 - Displays results in a formatted JSON output
+- Reports hit rates of the LLM response and query embedding caches
 
 ## Dependencies
 
@@ -36,31 +37,54 @@ integrating video fetching, transcription, summarization, and content idea gener
    - summary.py: For generating summaries
    - YouTubeAgent.py: For content idea generation
 
-2. **Output Directory**
-   - 'output/' folder for saving transcriptions
+2. **Working Directories**
+   - 'work/' folder with one private subfolder per request for new transcriptions
+   - 'processed/' folder where ingested transcriptions are kept
 
 ## Functions
 
 1. format_results(results)
    - Formats view counts with commas
    - Cleans transcript preview text
+   - Works on a copy so results can be re-rendered while analysis runs
    
-2. analyze(topic)
-   - Main processing function
+2. run_analysis(topic)
+   - Main processing function (generator, streams results to the interface)
+   - Safe to run for several users at once: state is kept per request and the
+     queue limits concurrency (see REQUEST_CONFIG)
+
+3. analyze(topic)
+   - Entry point of the interface
+   - Returns cached results of a topic instantly, refreshing stale ones in the
+     background (see topic_cache.py and TOPIC_CACHE_CONFIG)
+   - Concurrent requests for the same topic follow one shared run_analysis
    - Coordinates all operations:
      - Video fetching
-     - Transcription
+     - Transcription (videos processed concurrently, see PIPELINE_CONFIG)
      - Summary generation
      - Content idea creation
+     - Vector ingest (runs in the background, overlapping the summary and idea)
+
+4. get_cache_stats() / log_cache_stats()
+   - Hits, misses and hit rate of the LLM response cache (llm_cache.py) and the
+     query embedding cache (embedding_cache.py) since the server started
+   - Logged after every analysis and shown in the "Cache statistics" panel
 
 ## Returns
-JSON output containing:
+JSON output, updated as each step finishes:
+- Video information appears as soon as videos are fetched
+- Transcript previews grow while Whisper is running
+- Topic title, summary and key points appear one by one while the response streams
+- Content idea sections appear as they are generated
+
+Final output contains:
 1. Video Information
    - Title
    - Channel
    - Views
    - Transcript preview
    - File paths
+   - Transcript source (captions, Whisper or cache)
 2. Analysis
    - Topic title
    - Summary
@@ -76,16 +100,31 @@ JSON output containing:
 """
 
 
+import copy
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 import gradio as gr
 from fetch_youtube_videos import fetch_videos
-from transcribe_videos import transcribe_and_save
-from summary import generate_combined_summary_and_key_points
-from YouTubeAgent import generateidea
+from transcribe_videos import transcribe_stream, start_transcribe_pool
+from summary import stream_combined_summary_and_key_points
+from YouTubeAgent import stream_idea
 from embeddings import mainApp
+from topic_cache import make_key, get_result, put_result, is_fresh, join_flight, refresh_in_background
+from llm_cache import get_cache_stats as get_llm_cache_stats
+from embedding_cache import get_cache_stats as get_embedding_cache_stats
+from config import REQUEST_CONFIG
+
+# Vector ingest runs in the background while the summary and idea are generated
+ingest_pool = ThreadPoolExecutor(max_workers=REQUEST_CONFIG["ingest_workers"])
+
+ANALYSIS_FIELDS = {"topic_title": "Topic Title", "summary": "Summary", "key_points": "Key Points"}
 
 def format_results(results):
     """Format results for better display"""
     if isinstance(results, list):
+        results = copy.deepcopy(results)  # Results are re-rendered while analysis is running
         for result in results:
             if 'Views' in result:
                 result['Views'] = f"{result['Views']:,}"  # Format numbers with commas
@@ -93,76 +132,179 @@ def format_results(results):
                 result['Transcript Preview'] = result['Transcript Preview'].replace('\n', ' ')
     return results
 
-def analyze(topic):
+def create_request_dir():
+    """Creates a private working directory for one analyze request."""
+    os.makedirs(REQUEST_CONFIG["work_dir"], exist_ok=True)
+    return tempfile.mkdtemp(prefix="request-", dir=REQUEST_CONFIG["work_dir"])
+
+def remove_request_dir(request_dir, ingest=None):
+    """Deletes a request's working directory once its background ingest (if any) is done."""
+    if ingest is None:
+        shutil.rmtree(request_dir, ignore_errors=True)
+    else:
+        ingest.add_done_callback(lambda _: shutil.rmtree(request_dir, ignore_errors=True))
+
+def run_analysis(topic):
     """
     Fetch videos, transcribe them, and generate analysis including summaries and content ideas.
+    Yields the formatted results after every step so the interface shows video details,
+    partial transcripts and the analysis as soon as each one is available.
     """
-    if not topic.strip():
-        return {"error": "⚠️ Please enter a topic to analyze"}
+    # Requests run concurrently, so each one keeps its transcripts in its own directory
+    request_dir = create_request_dir()
+    ingest = None
     
     try:
         # Fetch videos based on topic
         videos = fetch_videos(topic)
         
         if isinstance(videos, str):
-            return {"error": f"⚠️ {videos}"}
+            yield {"error": f"⚠️ {videos}"}
+            return
         
         if not videos:
-            return {"error": "⚠️ No relevant videos found for this topic."}
+            yield {"error": "⚠️ No relevant videos found for this topic."}
+            return
         
-        results = []
-        transcriptions = []  # Store transcriptions for summary generation
+        results = [
+            {
+                'Video': video['title'],
+                'Channel': video['channel'],
+                'Views': video['views'],
+                'Transcript Preview': "⏳ Transcribing..."
+            }
+            for video in videos
+        ]
+        transcriptions = [None] * len(videos)  # Store transcriptions for summary generation
+        partial_transcripts = [""] * len(videos)
+        yield format_results(results)
         
-        # Process each video
-        for video in videos:
-            transcription_result = transcribe_and_save(video['url'])
-            
-            if "error" in transcription_result:
-                results.append({
-                    'Video': video['title'],
-                    'Channel': video['channel'],
-                    'Views': video['views'],
-                    'Transcript Preview': transcription_result["error"]
-                })
+        # Transcribe all videos concurrently, showing transcript segments as they arrive
+        for event, index, payload in transcribe_stream([video['url'] for video in videos], output_dir=request_dir):
+            if event == "segment":
+                partial_transcripts[index] = (partial_transcripts[index] + " " + payload["text"]).strip()
+                results[index]['Transcript Preview'] = partial_transcripts[index][:500] + "..."
+            elif "error" in payload:
+                results[index]['Transcript Preview'] = payload["error"]
             else:
-                results.append({
-                    'Video': video['title'],
-                    'Channel': video['channel'],
-                    'Views': video['views'],
-                    'Transcript Preview': transcription_result["transcription"][:500] + "...",
-                    'Transcript File': transcription_result["file_path"]
-                })
+                results[index]['Transcript Preview'] = payload["transcription"][:500] + "..."
+                results[index]['Transcript File'] = payload["file_path"]
+                results[index]['Transcript Source'] = payload["source"]
                 # Add transcription for summary generation
-                transcriptions.append(transcription_result["transcription"])
+                transcriptions[index] = payload["transcription"]
+            yield format_results(results)
+        
+        transcriptions = [transcription for transcription in transcriptions if transcription is not None]
         
         # Generate summary and content ideas if transcriptions exist
         if transcriptions:
             
-            mainApp(topic)
+            # Store the transcripts for retrieval while the model works on the summary
+            ingest = ingest_pool.submit(mainApp, topic, request_dir)
+            
+            analysis = {
+                "Topic Title": "⏳ Generating...",
+                "Summary": "⏳ Generating...",
+                "Key Points": [],
+                "Content Idea": "⏳ Generating..."
+            }
+            results.append({"Analysis": analysis})
+            yield format_results(results)
             
-            topic_title, summary, key_points = generate_combined_summary_and_key_points(transcriptions)
+            # Show each summary section as soon as it has been streamed
+            for name, value in stream_combined_summary_and_key_points(transcriptions):
+                analysis[ANALYSIS_FIELDS[name]] = value
+                yield format_results(results)
             
-            # Generate content idea
+            # Generate content idea, section by section
             input_for_idea = {
-                "summary": summary,
-                "keypoints": key_points
+                "summary": analysis["Summary"],
+                "keypoints": analysis["Key Points"]
             }
-            content_idea = generateidea(input_for_idea)
+            for idea in stream_idea(input_for_idea):
+                analysis["Content Idea"] = idea
+                yield format_results(results)
             
-            # Add analysis to results
-            results.append({
-                "Analysis": {
-                    "Topic Title": topic_title,
-                    "Summary": summary,
-                    "Key Points": key_points,
-                    "Content Idea": content_idea
-                }
-            })
+            ingest.result()
         
-        return format_results(results)
+        yield format_results(results)
 
     except Exception as e:
-        return {"error": f"⚠️ An unexpected error occurred: {str(e)}"}
+        yield {"error": f"⚠️ An unexpected error occurred: {str(e)}"}
+    
+    finally:
+        remove_request_dir(request_dir, ingest)
+
+def is_complete(results):
+    """
+    Whether final results are worth caching: every video was transcribed and every
+    analysis field was generated without an error. Failures are often transient
+    (API or download errors), so they are recomputed on the next request instead.
+    """
+    if not isinstance(results, list):
+        return False
+    
+    videos = [result for result in results if "Video" in result]
+    analyses = [result["Analysis"] for result in results if "Analysis" in result]
+    if not videos or len(analyses) != 1:
+        return False
+    
+    if any("Transcript File" not in video for video in videos):
+        return False  # Transcription failed for this video
+    
+    analysis = analyses[0]
+    texts = [analysis["Topic Title"], analysis["Summary"], analysis["Content Idea"]]
+    if any(not text or text.startswith(("Error", "⏳")) for text in texts):
+        return False
+    return bool(analysis["Key Points"])
+
+def get_cache_stats():
+    """Returns the hit/miss metrics of the response and embedding caches of this process."""
+    return {
+        "llm_responses": get_llm_cache_stats(),
+        "query_embeddings": get_embedding_cache_stats(),
+    }
+
+def log_cache_stats():
+    stats = get_cache_stats()
+    print("Cache stats: " + ", ".join(
+        f"{name} {values['hits']} hits / {values['misses']} misses ({values['hit_rate']:.0%})"
+        for name, values in stats.items()
+    ))
+
+def run_and_cache_analysis(topic, key):
+    """Runs the analysis of a topic and caches the final results if they are complete."""
+    results = None
+    try:
+        for results in run_analysis(topic):
+            yield results
+    finally:
+        log_cache_stats()
+    
+    if is_complete(results):
+        put_result(key, results)
+
+def analyze(topic):
+    """
+    Answers a topic from the topic cache when possible, otherwise follows its analysis.
+    Concurrent requests for the same topic share one running analysis.
+    """
+    if not topic.strip():
+        yield {"error": "⚠️ Please enter a topic to analyze"}
+        return
+    
+    key = make_key(topic)
+    compute = lambda: run_and_cache_analysis(topic, key)
+    
+    cached = get_result(key)
+    if cached is not None:
+        results, age = cached
+        if not is_fresh(age):
+            refresh_in_background(key, compute)  # Serve the stale results now, refresh if a worker is free
+        yield results
+        return
+    
+    yield from join_flight(key, compute).follow()
 
 # Create Gradio interface with improved styling
 with gr.Blocks(theme=gr.themes.Soft()) as app:
@@ -196,6 +338,10 @@ with gr.Blocks(theme=gr.themes.Soft()) as app:
             show_label=True
         )
     
+    with gr.Accordion("Cache statistics", open=False):
+        cache_stats = gr.JSON(show_label=False)
+        stats_btn = gr.Button("🔄 Refresh")
+    
     # Add footer
     gr.Markdown(
         """
@@ -214,8 +360,18 @@ with gr.Blocks(theme=gr.themes.Soft()) as app:
         api_name="analyze"
     )
     clear_btn.click(lambda: None, None, topic_input, queue=False)
+    stats_btn.click(get_cache_stats, None, cache_stats, queue=False)
 
 if __name__ == "__main__":
+    # Whisper runs only in the pool's worker processes; start them (and load their
+    # models) now rather than on the first request
+    start_transcribe_pool()
+    # Required for streaming results from the analyze generator; also bounds how many
+    # requests run at once and how many may wait
+    app.queue(
+        concurrency_count=REQUEST_CONFIG["concurrency_limit"],
+        max_size=REQUEST_CONFIG["max_queue_size"]
+    )
     app.launch()
 
 
@@ -0,0 +1,190 @@
+"""
+# Transcription Backend Benchmark
+
+This module compares the transcription backends (see BACKENDS in transcribe_videos.py) on
+a fixed local audio sample, reporting speed as real-time factor and accuracy as word
+error rate against a reference transcript.
+
+## Summary
+- Decodes the sample once to 16 kHz PCM and splits it like the pipeline does
+- Loads and warms up each backend before timing it
+- Real-time factor (RTF): processing time divided by audio duration; below 1 is
+  faster than real time
+- Word error rate (WER): word-level edit distance to the reference divided by the
+  reference length, after lowercasing and removing punctuation
+- Compares batched decoding (run_model_batch, as used by the SegmentBatcher) with
+  decoding one window at a time on the same windows, for speed and WER
+
+## Usage
+```
+python benchmark_transcription.py sample.mp3 sample_reference.txt
+```
+Backends and compute types compared are listed in RUNS; the model size, thread count
+and beam size come from WHISPER_CONFIG. The batching comparison uses the configured
+backend and WHISPER_CONFIG["batch_size"] (BATCH_SIZE when batching is disabled).
+
+## Dependencies
+
+### System Requirements
+- Python 3.8+
+- FFmpeg
+
+### Package Dependencies
+1. **openai-whisper** and **faster-whisper**
+   - Install: `pip install openai-whisper faster-whisper`
+   - Purpose: The backends being compared
+
+### Project Dependencies
+1. transcribe_videos.py
+   - run_model(), run_model_batch() and BACKENDS
+
+2. download_audio.py / segment_audio.py
+   - Decoding and speech segmentation
+
+## Functions
+1. normalize_words(text)
+   - Returns the lowercased words of a text without punctuation
+
+2. word_error_rate(reference, hypothesis)
+   - Returns the WER of a hypothesis
+
+3. benchmark(audio, reference, backend, compute_type)
+   - Returns rtf, wer and seconds for one backend
+
+4. benchmark_batching(audio, reference, batch_size)
+   - Returns seconds and wer of unbatched and batched decoding, and the speedup
+"""
+
+import re
+import sys
+import time
+import numpy as np
+from download_audio import SAMPLE_RATE, decode_audio, load_pcm, remove_spooled
+from segment_audio import plan_segments
+from config import WHISPER_CONFIG
+from transcribe_videos import run_model, run_model_batch
+
+# (backend, compute type) pairs compared by default
+RUNS = [
+    ("openai", "float32"),
+    ("faster-whisper", "float32"),
+    ("faster-whisper", "int8"),
+]
+
+# Batch size compared when WHISPER_CONFIG["batch_size"] disables batching
+BATCH_SIZE = 8
+
+def normalize_words(text):
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+def word_error_rate(reference, hypothesis):
+    """
+    Computes the word error rate.
+    Args:
+        reference (str): Correct transcript.
+        hypothesis (str): Transcript to score.
+    Returns:
+        float: (substitutions + deletions + insertions) / reference words.
+    """
+    reference = normalize_words(reference)
+    hypothesis = normalize_words(hypothesis)
+
+    # Edit distance over words, one row at a time
+    previous = list(range(len(hypothesis) + 1))
+    for position, word in enumerate(reference, 1):
+        current = [position]
+        for column, other in enumerate(hypothesis, 1):
+            current.append(min(previous[column] + 1, current[column - 1] + 1, previous[column - 1] + (word != other)))
+        previous = current
+
+    return previous[-1] / max(len(reference), 1)
+
+def benchmark(audio, reference, backend, compute_type):
+    """
+    Transcribes a sample with one backend.
+    Args:
+        audio (numpy.ndarray): 16 kHz mono float32 samples.
+        reference (str): Correct transcript.
+        backend (str): Key of BACKENDS.
+        compute_type (str): Compute type of the model.
+    Returns:
+        dict: rtf, wer and seconds.
+    """
+    # Load and warm up outside the timed section
+    run_model(np.zeros(SAMPLE_RATE, dtype=np.float32), backend=backend, compute_type=compute_type)
+
+    start = time.perf_counter()
+    texts = [
+        run_model(np.array(audio[begin:end]), backend=backend, compute_type=compute_type)["text"]
+        for begin, end in plan_segments(audio)
+    ]
+    seconds = time.perf_counter() - start
+
+    return {
+        "rtf": seconds / (len(audio) / SAMPLE_RATE),
+        "wer": word_error_rate(reference, " ".join(texts)),
+        "seconds": seconds,
+    }
+
+def benchmark_batching(audio, reference, batch_size):
+    """
+    Decodes the same windows one at a time and in batches with the configured backend.
+    Args:
+        audio (numpy.ndarray): 16 kHz mono float32 samples.
+        reference (str): Correct transcript.
+        batch_size (int): Windows per batch.
+    Returns:
+        dict: unbatched and batched (each with seconds and wer) and speedup.
+    """
+    windows = [np.array(audio[begin:end]) for begin, end in plan_segments(audio)]
+
+    # Load and warm up outside the timed sections
+    run_model_batch([np.zeros(SAMPLE_RATE, dtype=np.float32)] * 2)
+
+    start = time.perf_counter()
+    unbatched = [run_model(window)["text"] for window in windows]
+    unbatched_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = [
+        result["text"]
+        for first in range(0, len(windows), batch_size)
+        for result in run_model_batch(windows[first:first + batch_size])
+    ]
+    batched_seconds = time.perf_counter() - start
+
+    return {
+        "unbatched": {"seconds": unbatched_seconds, "wer": word_error_rate(reference, " ".join(unbatched))},
+        "batched": {"seconds": batched_seconds, "wer": word_error_rate(reference, " ".join(batched))},
+        "speedup": unbatched_seconds / batched_seconds,
+    }
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("Usage: python benchmark_transcription.py <audio file> <reference transcript>")
+
+    with open(sys.argv[2], "r", encoding="utf-8") as file:
+        reference = file.read()
+
+    audio = load_pcm(decode_audio(sys.argv[1], "benchmark-sample"))
+    print(f"Sample: {len(audio) / SAMPLE_RATE:.1f} s of audio, {len(normalize_words(reference))} reference words")
+
+    try:
+        for backend, compute_type in RUNS:
+            try:
+                result = benchmark(audio, reference, backend, compute_type)
+            except ImportError as e:
+                print(f"{backend:15s} {compute_type:8s} skipped ({e})")
+                continue
+            print(f"{backend:15s} {compute_type:8s} RTF={result['rtf']:.3f} WER={result['wer']:.3f} "
+                  f"({result['seconds']:.1f} s)")
+
+        batch_size = WHISPER_CONFIG["batch_size"] if WHISPER_CONFIG["batch_size"] > 1 else BATCH_SIZE
+        result = benchmark_batching(audio, reference, batch_size)
+        for mode in ("unbatched", "batched"):
+            print(f"{WHISPER_CONFIG['backend']:15s} {mode:9s} WER={result[mode]['wer']:.3f} "
+                  f"({result[mode]['seconds']:.1f} s)")
+        print(f"Batches of {batch_size}: {result['speedup']:.2f}x the unbatched speed")
+    finally:
+        del audio
+        remove_spooled("benchmark-sample")
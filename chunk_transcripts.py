@@ -0,0 +1,204 @@
+"""
+# Transcript Chunking Module
+
+This module splits transcripts into overlapping passages that fit the embedding model's
+input window, so every part of a video is embedded and retrieval can return the passage
+that matched instead of the whole transcript.
+
+## Summary
+- Splits text into sentences and snaps passage boundaries to them
+- Sizes passages by token count using the embedding model's tokenizer
+- Repeats trailing sentences of a passage at the start of the next one (overlap)
+- Cuts text without sentence boundaries (e.g. unpunctuated automatic captions) into
+  small word windows, so those passages keep the configured overlap too
+- Maps passages to video timestamps when Whisper segments are available
+
+## Dependencies
+
+### System Requirements
+- Python 3.8+
+
+### Package Dependencies
+No additional package installations required beyond project dependencies
+
+### Project Dependencies
+1. config.py
+   - Provides CHUNK_CONFIG with:
+     - max_tokens
+     - overlap_tokens
+
+## Functions
+1. split_sentences(text)
+   - Returns (start, end) character ranges of sentences
+
+2. chunk_transcript(text, count_tokens, segments=None)
+   - Returns passages of at most max_tokens tokens with overlap_tokens of overlap
+   - Every passage ends after the previous one, so none is only a repeated overlap
+
+3. check_passages(passages)
+   - Returns False if any passage does not extend past the end of the previous one
+
+## Returns
+List of dictionaries containing:
+- text: Passage text
+- chunk_index: Position of the passage in the transcript
+- start_char / end_char: Character range in the transcript
+- start / end: Time range in seconds (only when segments are given)
+"""
+
+import re
+from config import CHUNK_CONFIG
+
+SENTENCE_PATTERN = re.compile(r"[^.!?]+(?:[.!?]+|$)")
+WORD_PATTERN = re.compile(r"\S+")
+
+def split_sentences(text):
+    """
+    Finds sentence boundaries in a transcript.
+    Args:
+        text (str): Transcript text.
+    Returns:
+        list: (start, end) character ranges, whitespace trimmed.
+    """
+    sentences = []
+    for match in SENTENCE_PATTERN.finditer(text):
+        start, end = match.span()
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if start < end:
+            sentences.append((start, end))
+    return sentences
+
+def split_long_sentence(text, start, end, count_tokens, max_tokens):
+    """
+    Cuts a sentence into word-aligned pieces of at most max_tokens tokens.
+    """
+    pieces = []
+    piece_start = None
+    piece_end = None
+    for match in WORD_PATTERN.finditer(text, start, end):
+        if piece_start is not None and count_tokens(text[piece_start:match.end()]) > max_tokens:
+            pieces.append((piece_start, piece_end))
+            piece_start = None
+        if piece_start is None:
+            piece_start = match.start()
+        piece_end = match.end()
+    if piece_start is not None:
+        pieces.append((piece_start, piece_end))
+    return pieces
+
+def locate_segments(text, segments):
+    """
+    Finds the character range of each timed segment in the transcript.
+    Returns (start_char, end_char, start_seconds, end_seconds) tuples.
+    """
+    located = []
+    cursor = 0
+    for segment in segments:
+        position = text.find(segment["text"], cursor)
+        if position == -1:
+            continue
+        cursor = position + len(segment["text"])
+        located.append((position, cursor, segment["start"], segment["end"]))
+    return located
+
+def chunk_transcript(text, count_tokens, segments=None):
+    """
+    Splits a transcript into overlapping, sentence-aligned passages.
+    Args:
+        text (str): Transcript text.
+        count_tokens (callable): Returns the number of model tokens in a string.
+        segments (list): Optional Whisper segments with start, end and text.
+    Returns:
+        list: Passage dictionaries, see module documentation.
+    """
+    max_tokens = CHUNK_CONFIG["max_tokens"]
+    overlap_tokens = CHUNK_CONFIG["overlap_tokens"]
+    # Oversized sentences become windows small enough that a few of them fill the
+    # overlap; pieces of max_tokens could never be repeated in the next passage
+    window_tokens = max(1, min(max_tokens, overlap_tokens // 2)) if overlap_tokens else max_tokens
+
+    # Sentence units with their token counts; oversized sentences are split on words
+    units = []
+    for start, end in split_sentences(text):
+        tokens = count_tokens(text[start:end])
+        if tokens <= max_tokens:
+            units.append((start, end, tokens))
+        else:
+            for piece_start, piece_end in split_long_sentence(text, start, end, count_tokens, window_tokens):
+                units.append((piece_start, piece_end, count_tokens(text[piece_start:piece_end])))
+
+    chunks = []
+    first = 0
+    while first < len(units):
+        last = first
+        total = units[first][2]
+        while last + 1 < len(units) and total + units[last + 1][2] <= max_tokens:
+            last += 1
+            total += units[last][2]
+
+        chunks.append((units[first][0], units[last][1]))
+        if last + 1 >= len(units):
+            break
+
+        # Start the next passage with the trailing sentences that fit in the overlap,
+        # keeping room for the next new sentence so no passage is only a repeat
+        next_first = last + 1
+        overlap = 0
+        room = max_tokens - units[last + 1][2]
+        while (next_first - 1 > first
+               and overlap + units[next_first - 1][2] <= min(overlap_tokens, room)):
+            next_first -= 1
+            overlap += units[next_first][2]
+        first = next_first
+
+    located = locate_segments(text, segments) if segments else []
+
+    passages = []
+    for index, (start, end) in enumerate(chunks):
+        passage = {"text": text[start:end], "chunk_index": index, "start_char": start, "end_char": end}
+        covering = [segment for segment in located if segment[0] < end and segment[1] > start]
+        if covering:
+            passage["start"] = covering[0][2]
+            passage["end"] = covering[-1][3]
+        passages.append(passage)
+    return passages
+
+def check_passages(passages):
+    """
+    Checks that every passage adds new text after the end of the previous one.
+    Args:
+        passages (list): Result of chunk_transcript.
+    Returns:
+        bool: True if each passage ends later than the one before it.
+    """
+    return all(current["end_char"] > previous["end_char"] for previous, current in zip(passages, passages[1:]))
+
+if __name__ == "__main__":
+    import random
+
+    # Word counts stand in for the tokenizer; long sentences exercise split_long_sentence
+    count_words = lambda text: len(WORD_PATTERN.findall(text))
+    rng = random.Random(0)
+    words = "one two three four five six seven eight nine ten".split()
+    for max_tokens, overlap_tokens in ((10, 4), (20, 8), (50, 40), (200, 40)):
+        CHUNK_CONFIG["max_tokens"], CHUNK_CONFIG["overlap_tokens"] = max_tokens, overlap_tokens
+        for _ in range(200):
+            text = " ".join(
+                " ".join(rng.choice(words) for _ in range(rng.randint(1, 3 * max_tokens))) + "."
+                for _ in range(rng.randint(1, 30))
+            )
+            passages = chunk_transcript(text, count_words)
+            assert check_passages(passages), (max_tokens, overlap_tokens, text)
+            assert all(count_words(passage["text"]) <= max_tokens for passage in passages)
+
+        # Unpunctuated text (automatic captions) must still overlap by about overlap_tokens
+        text = " ".join(rng.choice(words) for _ in range(20 * max_tokens))
+        passages = chunk_transcript(text, count_words)
+        assert check_passages(passages)
+        for previous, current in zip(passages, passages[1:]):
+            overlap = count_words(text[current["start_char"]:previous["end_char"]])
+            assert overlap_tokens // 2 <= overlap <= overlap_tokens, (max_tokens, overlap_tokens, overlap)
+        print(f"max_tokens={max_tokens} overlap_tokens={overlap_tokens}: OK")
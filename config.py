@@ -85,4 +85,141 @@ FILTER_CONFIG = {
     # "blocked_keywords": {"fun", "experiment", "joke", "prank", "vlog"},
     "max_results": 10,          # Limit search results to 10 videos
     "min_view_count": 10000     # Minimum view count for relevance
-}
\ No newline at end of file
+}
+
+# Transcript Cache Settings
+TRANSCRIPT_CACHE_CONFIG = {
+    "path": "cache/transcripts.db",    # SQLite file shared by every worker process
+    "max_entries": 5000,               # Least recently used transcripts beyond this are evicted
+    "max_bytes": 500 * 1024 * 1024,    # Upper bound on stored transcript text
+    "max_age_days": 30                 # Transcripts older than this are re-transcribed
+}
+
+# Transcription Pipeline Settings
+PIPELINE_CONFIG = {
+    "download_workers": 3,    # Threads resolving and fetching audio (I/O-bound)
+    "transcribe_workers": 2   # Processes running Whisper inference on audio segments (CPU-bound)
+}
+
+# Audio Download Settings
+AUDIO_CONFIG = {
+    "spool_dir": "spool",                 # Downloaded and decoded audio waiting for transcription
+    "http_chunk_size": 10 * 1024 * 1024,  # Download audio in 10 MB HTTP range requests
+    "retries": 5,                         # Retries per request/fragment before giving up
+    "keep_audio": False                   # Keep the compressed download after decoding
+}
+
+# Voice Activity Detection Settings (long-form transcription)
+VAD_CONFIG = {
+    "frame_ms": 30,               # Energy is measured over 30 ms frames
+    "silence_floor_db": -50,      # Frames quieter than this are always silence
+    "dynamic_range_db": 40,       # Frames this far below the loudest frame are silence
+    "min_speech_ms": 250,         # Shorter bursts are treated as noise
+    "min_silence_ms": 500,        # Shorter pauses are kept inside speech
+    "padding_ms": 200,            # Context kept around each speech region
+    "max_segment_seconds": 30,    # One Whisper window per segment
+    "cut_search_ms": 5000         # Longer speech is cut at the quietest frame this close to the limit
+}
+
+# Whisper Model Settings
+WHISPER_CONFIG = {
+    "backend": "openai",        # "openai" (openai-whisper, PyTorch) or "faster-whisper" (CTranslate2, quantized)
+    "model_name": "base",       # tiny / base / small / medium / large: trade speed for accuracy
+    "device": "cpu",            # Device the model runs on
+    "compute_type": "float32",  # "float16" only helps on GPU; "int8" (faster-whisper) is fastest on CPU
+    "cpu_threads": 0,           # Threads per transcription worker, 0 keeps the library default
+    "beam_size": 1,             # 1 decodes greedily; larger beams are slower but may be more accurate
+    "batch_size": 1,            # Audio windows decoded together in one forward pass (1 disables batching)
+    "batch_wait_ms": 50,        # Longest wait for more windows before a partial batch is decoded
+    "preload": False            # Load and warm up the model at startup instead of first use
+}
+
+# Sentence Embedding Settings
+EMBEDDING_CONFIG = {
+    "model_name": "all-MiniLM-L6-v2",  # 384-dimensional sentence-transformers model
+    "batch_size": 32,                  # Texts encoded per forward pass
+    "backend": "torch",                # "torch" (sentence-transformers) or "onnx" (exported model, see onnx_embeddings.py)
+    "onnx_dir": "models/all-MiniLM-L6-v2-onnx",  # Exported model and tokenizer
+    "onnx_quantized": True,            # Use the int8 model instead of the float32 export
+    "onnx_threads": 0,                 # ONNX Runtime threads, 0 keeps the library default
+    "max_seq_length": 256              # Longer texts are truncated, as by the sentence-transformers model
+}
+
+# Transcript Chunking Settings
+CHUNK_CONFIG = {
+    "max_tokens": 200,     # Passage size; all-MiniLM-L6-v2 truncates input after 256 word pieces
+    "overlap_tokens": 40   # Tokens repeated between consecutive passages
+}
+
+# Vector Store Settings
+VECTOR_STORE_CONFIG = {
+    "backend": "pinecone",         # "pinecone" (serverless) or "local" (in-process, on disk)
+    "local_path": "vector_store",  # Directory of local indexes, one subdirectory per index
+    "dimension": 384,              # Embedding size of EMBEDDING_CONFIG["model_name"]
+    "ann": True,                   # Use an IVF index for local search on large namespaces
+    "ann_min_vectors": 50000,      # Below this, exact search is fast enough and no index is built
+    "nlist": 1024,                 # IVF clusters
+    "nprobe": 32,                  # Clusters searched per query: higher is slower but more accurate
+    "pinecone_grpc": False,        # Use the gRPC Pinecone client (requires pinecone[grpc])
+    "pool_threads": 8              # Connection pool size of the HTTP Pinecone index client
+}
+
+# Vector Upsert Settings
+UPSERT_CONFIG = {
+    "batch_size": 100,                 # Vectors per upsert request
+    "max_batch_bytes": 1800 * 1024,    # Serialized size per request, below Pinecone's 2 MB limit
+    "workers": 4                       # Upsert requests in flight at once
+}
+
+# Vector Ingest Settings
+INGEST_CONFIG = {
+    "manifest_path": "cache/ingest.db"   # Records which transcript versions are already in the vector index
+}
+
+# LLM Response Cache Settings
+LLM_CACHE_CONFIG = {
+    "path": "cache/llm.db",          # SQLite file shared by every worker process
+    "ttl_seconds": 7 * 24 * 3600,    # Responses older than this are regenerated
+    "max_entries": 10000             # Least recently used responses beyond this are evicted
+}
+
+# Summarization Settings
+SUMMARY_CONFIG = {
+    "max_prompt_chars": 60000,   # Longer transcription sets are summarized map-reduce style
+    "chunk_chars": 20000,        # Size of each part summarized in the map step
+    "max_workers": 4             # Concurrent Gemini requests in the map step
+}
+
+# Request Handling Settings (Gradio interface)
+REQUEST_CONFIG = {
+    "work_dir": "work",          # Each analyze request writes its transcripts to its own folder here
+    "concurrency_limit": 4,      # Analyze requests processed at once
+    "max_queue_size": 32,        # Further requests are rejected while this many are waiting
+    "ingest_workers": 2          # Background vector ingests running at once
+}
+
+# Topic Result Cache Settings
+TOPIC_CACHE_CONFIG = {
+    "path": "cache/topics.db",          # SQLite file with the final results of each topic
+    "fresh_seconds": 6 * 3600,          # Results younger than this are served as they are
+    "max_age_seconds": 48 * 3600,       # Older results are served while a refresh runs, up to this age
+    "max_entries": 1000,                # Least recently used topics beyond this are evicted
+    "max_flights": 4,                   # Analyses of uncached topics running at once (match REQUEST_CONFIG concurrency_limit)
+    "refresh_workers": 1                # Background refreshes of stale topics running at once; extra ones are skipped
+}
+
+# Caption Settings (used before falling back to Whisper)
+CAPTION_CONFIG = {
+    "enabled": True,
+    "languages": ["en", "en-US", "en-GB"],   # Caption languages to use, in order of preference
+    "allow_auto": True,                      # Also use YouTube's automatic captions
+    "min_words_per_minute": 40,              # Sparser captions are treated as incomplete
+    "min_coverage": 0.5                      # Captions must span at least this share of the video
+}
+
+# Query Embedding Cache Settings
+QUERY_CACHE_CONFIG = {
+    "max_entries": 10000,                          # Query embeddings kept in memory (about 1.5 KB each)
+    "persist_path": "cache/query_embeddings.db",   # SQLite file kept across restarts, None keeps memory only
+    "max_persisted": 100000                        # Least recently used persisted embeddings beyond this are evicted
+}
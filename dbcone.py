@@ -1,39 +1,163 @@
 from pinecone import Pinecone, ServerlessSpec
+from config import VECTOR_STORE_CONFIG
+from localdb import LocalIndex
+from urllib3.exceptions import MaxRetryError, ProtocolError, TimeoutError as TransportTimeout
+import threading
 import time
 import os
 
 pc_database = None
+pc_indexes = {}
+pc_indexes_lock = threading.Lock()
+pc_index_locks = {}
+local_indexes = {}
+local_indexes_lock = threading.Lock()
+
+MAX_READY_WAIT = 16
+
+# gRPC status codes worth retrying (the REST client reports HTTP statuses instead)
+TRANSIENT_GRPC_CODES = {"UNAVAILABLE", "DEADLINE_EXCEEDED", "RESOURCE_EXHAUSTED", "INTERNAL"}
 
 
 def getDatabase():
+    
+    if VECTOR_STORE_CONFIG["backend"] == "local":
+        return None
+    
     pine_cone_key = os.getenv("PINECONE_API_KEY")
     
     global pc_database 
     
     if pc_database is None:
-        pc_database = Pinecone(api_key = pine_cone_key)
+        if VECTOR_STORE_CONFIG["pinecone_grpc"]:
+            # Requires pinecone[grpc]
+            from pinecone.grpc import PineconeGRPC
+            pc_database = PineconeGRPC(api_key = pine_cone_key)
+        else:
+            pc_database = Pinecone(api_key = pine_cone_key)
 
     return pc_database
 
+def getLocalIndex(index_name):
+    
+    # One LocalIndex per directory: its lock is what keeps concurrent upserts apart
+    with local_indexes_lock:
+        
+        if index_name not in local_indexes:
+            local_indexes[index_name] = LocalIndex(
+                os.path.join(VECTOR_STORE_CONFIG["local_path"], index_name),
+                VECTOR_STORE_CONFIG["dimension"]
+            )
+        
+        return local_indexes[index_name]
+
+def waitForIndex(local_db, index_name):
+    
+    # Poll with exponential backoff until the index reports ready
+    delay = 1
+    description = local_db.describe_index(index_name)
+    
+    while not description.status['ready']:
+        time.sleep(delay)
+        delay = min(delay * 2, MAX_READY_WAIT)
+        description = local_db.describe_index(index_name)
+    
+    return description
+
 def getDatabaseIndex(index_name):
     
-    local_db = getDatabase()
+    if VECTOR_STORE_CONFIG["backend"] == "local":
+        return getLocalIndex(index_name)
     
-    if not local_db.has_index(index_name):
-        local_db.create_index(
-            name=index_name,
-            dimension=384, # Replace with your model dimensions
-            metric="cosine", # Replace with your model metric
-            spec=ServerlessSpec(
-                cloud="aws",
-                region="us-east-1"
-            ) 
-        )
+    # Readiness is checked once per process; the Index handle and its connection pool are reused
+    with pc_indexes_lock:
+        
+        if index_name in pc_indexes:
+            return pc_indexes[index_name][0]
+        
+        index_lock = pc_index_locks.setdefault(index_name, threading.Lock())
     
-    while not local_db.describe_index(index_name).status['ready']:
-        time.sleep(1)
+    # Only callers of this index wait for it to become ready; other indexes stay available
+    with index_lock:
+        
+        cached = pc_indexes.get(index_name)
+        if cached is not None:
+            return cached[0]
+        
+        local_db = getDatabase()
+        
+        if not local_db.has_index(index_name):
+            local_db.create_index(
+                name=index_name,
+                dimension=VECTOR_STORE_CONFIG["dimension"],
+                metric="cosine", # Replace with your model metric
+                spec=ServerlessSpec(
+                    cloud="aws",
+                    region="us-east-1"
+                ) 
+            )
+        
+        host = waitForIndex(local_db, index_name).host
+        
+        if VECTOR_STORE_CONFIG["pinecone_grpc"]:
+            index = local_db.Index(host=host)
+        else:
+            index = local_db.Index(host=host, pool_threads=VECTOR_STORE_CONFIG["pool_threads"])
+        
+        with pc_indexes_lock:
+            pc_indexes[index_name] = (index, host)
+        
+        return index
 
-    index = local_db.Index(index_name)
-    return index
+def getAsyncDatabaseIndex(index_name):
+    
+    # asyncio client for high-concurrency querying (pinecone>=6, pinecone[asyncio]).
+    # It is bound to the running event loop, so use it as `async with` and do not share it.
+    getDatabaseIndex(index_name)
+    
+    return getDatabase().IndexAsyncio(host=pc_indexes[index_name][1])
 
+def forgetDatabaseIndex(index_name):
+    
+    with pc_indexes_lock:
+        pc_indexes.pop(index_name, None)
+
+def isTransientError(error):
+    
+    # Network failures, timeouts, rate limiting (429) and server errors (5xx) may pass on
+    # retry; anything else (bad request, auth, missing index) fails the same way again
+    if isinstance(error, (ConnectionError, TimeoutError, TransportTimeout, MaxRetryError, ProtocolError)):
+        return True
+    
+    status = getattr(error, "status", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    
+    code = getattr(error, "code", None)
+    if callable(code):
+        try:
+            return getattr(code(), "name", None) in TRANSIENT_GRPC_CODES
+        except Exception:
+            return False
+    
+    return False
 
+def runOnDatabaseIndex(index_name, operation, retries=2):
+    
+    # The local index has no network in between, so its errors are never transient
+    if VECTOR_STORE_CONFIG["backend"] == "local":
+        return operation(getLocalIndex(index_name))
+    
+    # Run a data-plane call; after a transient failure drop the cached handle so readiness
+    # is re-checked, back off and try again
+    for attempt in range(retries + 1):
+        
+        index = getDatabaseIndex(index_name)
+        
+        try:
+            return operation(index)
+        except Exception as e:
+            if attempt == retries or not isTransientError(e):
+                raise
+            forgetDatabaseIndex(index_name)
+            time.sleep(2 ** attempt)
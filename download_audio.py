@@ -0,0 +1,232 @@
+"""
+# Audio Download Module
+
+This module downloads YouTube audio to a local spool directory and decodes it once into
+the 16 kHz mono float32 PCM that Whisper consumes, so network transfer and decoding are
+separate steps from inference.
+
+## Summary
+- Downloads the best audio stream with yt-dlp in chunked HTTP requests
+- Resumes interrupted downloads from their .part files
+- Decodes audio with FFmpeg straight to a raw float32 file
+- Loads decoded audio as a read-only memory map (no copy into RAM)
+
+## Dependencies
+
+### System Requirements
+1. **FFmpeg**
+   - Must be available on the PATH
+2. Python 3.8+
+3. Disk space in the spool directory (about 4 MB per minute of decoded audio)
+
+### Package Dependencies
+1. **yt-dlp==2023.11.16**
+   - Install: `pip install yt-dlp`
+   - Purpose: YouTube audio downloading
+
+2. **numpy**
+   - Install: `pip install numpy`
+   - Purpose: Memory-mapped access to decoded audio
+
+### Project Dependencies
+1. config.py
+   - Provides AUDIO_CONFIG with:
+     - spool_dir
+     - http_chunk_size
+     - retries
+     - keep_audio
+
+## Functions
+1. extract_info(url)
+   - Looks up video metadata (formats, captions, duration) without downloading
+
+2. download_audio(url, video_id, info=None)
+   - Downloads (or resumes) the audio file and returns its local path
+   - Reuses metadata from extract_info instead of looking it up again
+
+3. decode_audio(audio_path, video_id)
+   - Converts audio to 16 kHz mono float32 PCM and returns the .pcm path
+
+4. fetch_pcm(url, video_id, info=None)
+   - Runs both steps, skipping them when decoded audio is already spooled
+
+5. load_pcm(pcm_path)
+   - Returns the decoded audio as a read-only numpy memory map
+
+6. remove_spooled(video_id, delete=True)
+   - Releases the spooled files of a video, deleting them once no request uses them
+
+## Error Handling
+- yt-dlp retries failed requests and fragments before raising
+- FFmpeg failures raise RuntimeError with FFmpeg's error output
+- Decoded files are written under a temporary name, so partial output is never reused
+- Concurrent requests for the same video share one download, and its files are only
+  removed once the last of them is done
+"""
+
+import glob
+import os
+import subprocess
+import threading
+import numpy as np
+import yt_dlp
+from config import AUDIO_CONFIG
+
+SAMPLE_RATE = 16000
+
+# Requests currently using each video's spooled files, and per-video download locks
+spool_users = {}
+spool_locks = {}
+spool_lock = threading.Lock()
+
+def get_spool_path(video_id, extension):
+    """
+    Builds the path of a spooled file for a video.
+    Args:
+        video_id (str): YouTube video ID.
+        extension (str): File extension without the dot.
+    Returns:
+        str: Path inside the spool directory.
+    """
+    return os.path.join(AUDIO_CONFIG["spool_dir"], f"{video_id}.{extension}")
+
+def extract_info(url):
+    """
+    Looks up the metadata of a video without downloading any media.
+    Args:
+        url (str): YouTube video URL.
+    Returns:
+        dict: yt-dlp video info, sanitized so it can be passed to download_audio.
+    """
+    options = {
+        'skip_download': True,
+        'retries': AUDIO_CONFIG["retries"],
+        'quiet': True,
+        'no_warnings': True,
+    }
+
+    with yt_dlp.YoutubeDL(options) as ydl:
+        return ydl.sanitize_info(ydl.extract_info(url, download=False), remove_private_keys=True)
+
+def download_audio(url, video_id, info=None):
+    """
+    Downloads the audio stream of a video into the spool directory.
+    Args:
+        url (str): YouTube video URL.
+        video_id (str): YouTube video ID, used as file name.
+        info (dict): Metadata from extract_info. If None, it is looked up here.
+    Returns:
+        str: Path to the downloaded audio file.
+    """
+    os.makedirs(AUDIO_CONFIG["spool_dir"], exist_ok=True)
+
+    options = {
+        'format': 'bestaudio',
+        'outtmpl': get_spool_path(video_id, '%(ext)s'),
+        'continuedl': True,
+        'http_chunk_size': AUDIO_CONFIG["http_chunk_size"],
+        'retries': AUDIO_CONFIG["retries"],
+        'fragment_retries': AUDIO_CONFIG["retries"],
+        'quiet': True,
+        'noprogress': True,
+    }
+
+    with yt_dlp.YoutubeDL(options) as ydl:
+        if info is None:
+            info = ydl.extract_info(url, download=True)
+        else:
+            # Selects the audio format from the known metadata and downloads it
+            info = ydl.process_ie_result(info, download=True)
+        return ydl.prepare_filename(info)
+
+def decode_audio(audio_path, video_id):
+    """
+    Decodes an audio file to 16 kHz mono float32 PCM.
+    Args:
+        audio_path (str): Path to the downloaded audio file.
+        video_id (str): YouTube video ID, used as file name.
+    Returns:
+        str: Path to the raw .pcm file.
+    """
+    # Also called directly on local files (e.g. by the benchmark), before any download
+    os.makedirs(AUDIO_CONFIG["spool_dir"], exist_ok=True)
+
+    pcm_path = get_spool_path(video_id, 'pcm')
+    temp_path = pcm_path + '.tmp'
+
+    command = [
+        "ffmpeg", "-nostdin", "-y", "-loglevel", "error",
+        "-i", audio_path,
+        "-ac", "1", "-ar", str(SAMPLE_RATE),
+        "-f", "f32le", temp_path
+    ]
+    completed = subprocess.run(command, capture_output=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Failed to decode audio: {completed.stderr.decode(errors='replace')}")
+
+    os.replace(temp_path, pcm_path)
+    return pcm_path
+
+def fetch_pcm(url, video_id, info=None):
+    """
+    Downloads and decodes the audio of a video, reusing spooled output.
+    Every call must be matched by a remove_spooled call once the audio is used.
+    Args:
+        url (str): YouTube video URL.
+        video_id (str): YouTube video ID.
+        info (dict): Metadata from extract_info, if already looked up.
+    Returns:
+        str: Path to the raw .pcm file.
+    """
+    with spool_lock:
+        spool_users[video_id] = spool_users.get(video_id, 0) + 1
+        lock = spool_locks.setdefault(video_id, threading.Lock())
+
+    try:
+        # A second request for the same video waits for the first download
+        with lock:
+            pcm_path = get_spool_path(video_id, 'pcm')
+            if os.path.isfile(pcm_path):
+                return pcm_path
+
+            audio_path = download_audio(url, video_id, info)
+            pcm_path = decode_audio(audio_path, video_id)
+
+            if not AUDIO_CONFIG["keep_audio"]:
+                os.remove(audio_path)
+
+            return pcm_path
+    except Exception:
+        remove_spooled(video_id, delete=False)
+        raise
+
+def load_pcm(pcm_path):
+    """
+    Opens decoded audio without reading it into memory.
+    Args:
+        pcm_path (str): Path to a raw .pcm file written by decode_audio.
+    Returns:
+        numpy.memmap: Read-only float32 samples at 16 kHz.
+    """
+    return np.memmap(pcm_path, dtype=np.float32, mode='r')
+
+def remove_spooled(video_id, delete=True):
+    """
+    Releases the spooled files of a video and deletes them once no other request
+    is using them.
+    Args:
+        video_id (str): YouTube video ID.
+        delete (bool): Delete the files when released by the last user; False keeps
+            them for a retry (e.g. after a failed transcription).
+    """
+    with spool_lock:
+        users = spool_users.get(video_id, 0) - 1
+        if users > 0:
+            spool_users[video_id] = users
+            return
+        spool_users.pop(video_id, None)
+        spool_locks.pop(video_id, None)
+
+        if delete:
+            for path in glob.glob(get_spool_path(glob.escape(video_id), '*')):
+                os.remove(path)
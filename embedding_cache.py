@@ -0,0 +1,205 @@
+"""
+# Query Embedding Cache Module
+
+This module keeps the embeddings of recent search texts, so repeated queries (the same topic
+and question strings) skip the transformer entirely.
+
+## Summary
+- Keys embeddings by embedding model ID and whitespace-normalised text
+- Holds up to max_entries float32 vectors in memory, evicting the least recently used
+- Optionally persists vectors to a SQLite file, so a restarted process keeps its hits;
+  if the file is locked or unreadable the query is simply encoded
+- Safe to share between threads; counts hits and misses for monitoring
+
+## Dependencies
+
+### System Requirements
+- Python 3.8+
+
+### Package Dependencies
+1. **numpy**
+   - Install: `pip install numpy`
+   - Purpose: Compact vector storage
+
+### Project Dependencies
+1. config.py
+   - Provides QUERY_CACHE_CONFIG with:
+     - max_entries
+     - persist_path
+     - max_persisted
+
+## Functions
+1. get_embedding(text, model_id, encode)
+   - Returns the cached embedding of a text, calling encode(text) on a miss
+
+2. get_cache_stats()
+   - Returns hits, misses, hit rate and size since the process started
+
+3. clear()
+   - Empties the in-memory cache (the persisted file is kept)
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from config import QUERY_CACHE_CONFIG
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model_id TEXT NOT NULL,
+    text TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (model_id, text)
+);
+CREATE INDEX IF NOT EXISTS embeddings_last_access ON embeddings (last_access);
+"""
+
+# Persisted entries beyond max_persisted are evicted after this many inserts
+EVICT_EVERY = 100
+
+entries = OrderedDict()
+lock = threading.Lock()
+stats = {"hits": 0, "misses": 0}
+connections = threading.local()
+
+def get_connection():
+    """
+    Returns this thread's connection to the persisted cache, opening it (and creating
+    the file) on first use.
+    Returns:
+        sqlite3.Connection: Connection in autocommit mode.
+    """
+    connection = getattr(connections, "connection", None)
+    if connection is None:
+        path = QUERY_CACHE_CONFIG["persist_path"]
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # A short timeout: computing the embedding beats waiting on a locked file
+        connection = sqlite3.connect(path, timeout=1, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SCHEMA)
+        connections.connection = connection
+        connections.inserts = 0
+    return connection
+
+def reset_connection():
+    """Drops this thread's connection after an error, so the next call reopens it."""
+    connection = getattr(connections, "connection", None)
+    connections.connection = None
+    if connection is not None:
+        try:
+            connection.close()
+        except sqlite3.Error:
+            pass
+
+def normalize_text(text):
+    return " ".join(text.split())
+
+def remember(key, vector):
+    """Adds a vector to the in-memory cache, evicting the least recently used beyond the limit."""
+    with lock:
+        entries[key] = vector
+        entries.move_to_end(key)
+        while len(entries) > QUERY_CACHE_CONFIG["max_entries"]:
+            entries.popitem(last=False)
+
+def load_persisted(model_id, text):
+    """Returns a persisted vector, or None if missing or the file cannot be read."""
+    try:
+        connection = get_connection()
+        row = connection.execute(
+            "SELECT vector FROM embeddings WHERE model_id = ? AND text = ?", (model_id, text)
+        ).fetchone()
+        if row is not None:
+            connection.execute(
+                "UPDATE embeddings SET last_access = ? WHERE model_id = ? AND text = ?",
+                (time.time(), model_id, text)
+            )
+    except sqlite3.Error:
+        reset_connection()
+        return None
+    return np.frombuffer(row[0], dtype=np.float32) if row is not None else None
+
+def save_persisted(model_id, text, vector):
+    """Persists a vector, evicting the least recently used every EVICT_EVERY inserts. Errors are ignored."""
+    try:
+        connection = get_connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO embeddings (model_id, text, vector, last_access) VALUES (?, ?, ?, ?)",
+            (model_id, text, vector.tobytes(), time.time())
+        )
+
+        connections.inserts += 1
+        if connections.inserts >= EVICT_EVERY:
+            connections.inserts = 0
+            (count,) = connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+            excess = count - QUERY_CACHE_CONFIG["max_persisted"]
+            if excess > 0:
+                # Walks the last_access index from the oldest entry, reading only the excess rows
+                connection.execute(
+                    "DELETE FROM embeddings WHERE rowid IN ("
+                    "SELECT rowid FROM embeddings ORDER BY last_access ASC LIMIT ?)",
+                    (excess,)
+                )
+    except sqlite3.Error:
+        reset_connection()
+
+def get_embedding(text, model_id, encode):
+    """
+    Returns the embedding of a search text, computing it only on a cache miss.
+    Args:
+        text (str): Search text.
+        model_id (str): Identifies the embedding model, so models never share entries.
+        encode (callable): Computes the embedding of a text on a miss.
+    Returns:
+        numpy.ndarray: Read-only float32 vector.
+    """
+    text = normalize_text(text)
+    key = (model_id, text)
+
+    with lock:
+        vector = entries.get(key)
+        if vector is not None:
+            entries.move_to_end(key)
+            stats["hits"] += 1
+            return vector
+
+    persist = bool(QUERY_CACHE_CONFIG["persist_path"])
+    vector = load_persisted(model_id, text) if persist else None
+
+    with lock:
+        stats["hits" if vector is not None else "misses"] += 1
+
+    if vector is None:
+        vector = np.asarray(encode(text), dtype=np.float32).copy()
+        if persist:
+            save_persisted(model_id, text, vector)
+
+    vector.flags.writeable = False
+    remember(key, vector)
+    return vector
+
+def get_cache_stats():
+    """
+    Returns cache metrics for this process.
+    Returns:
+        dict: hits, misses, hit_rate and size (entries in memory).
+    """
+    with lock:
+        total = stats["hits"] + stats["misses"]
+        return {
+            "hits": stats["hits"],
+            "misses": stats["misses"],
+            "hit_rate": stats["hits"] / total if total else 0.0,
+            "size": len(entries),
+        }
+
+def clear():
+    with lock:
+        entries.clear()
@@ -1,36 +1,100 @@
-from sentence_transformers import SentenceTransformer
 from dotenv import load_dotenv, find_dotenv
 from dbcone import getDatabase
-from dbcone import getDatabaseIndex
+from dbcone import runOnDatabaseIndex
 import os
-import uuid
 import pandas as pd
 import numpy as np
 from pathlib import Path
 from summary import generate_combined_summary_and_key_points
+from config import EMBEDDING_CONFIG, UPSERT_CONFIG
+from chunk_transcripts import chunk_transcript
+from ingest_manifest import content_hash, vector_id, get_ingested, record_ingested
+from embedding_cache import get_embedding
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 sentence_model = None
-inputDir = None
-outputDir = None
-topic = None
-db_index_name = None
-db_namespace_name = None
+model_lock = threading.Lock()
 
 
 
 def initialize_model():
     global sentence_model
-    sentence_model = SentenceTransformer('all-MiniLM-L6-v2')
+    if EMBEDDING_CONFIG["backend"] == "onnx":
+        from onnx_embeddings import OnnxEncoder
+        sentence_model = OnnxEncoder()
+    else:
+        # Imported here so serving nodes using the ONNX backend do not load torch
+        from sentence_transformers import SentenceTransformer
+        sentence_model = SentenceTransformer(EMBEDDING_CONFIG["model_name"])
 
 def get_model():
     if sentence_model is None:
-        initialize_model()
+        with model_lock:
+            if sentence_model is None:
+                initialize_model()
     return sentence_model
 
 def get_sentence_embedding(sentence):
     model = get_model()
     return model.encode(sentence)
 
+def get_model_id():
+    """Identifies the configured embedding model, so cached query embeddings are never mixed."""
+    if EMBEDDING_CONFIG["backend"] == "onnx":
+        return f'onnx:{EMBEDDING_CONFIG["onnx_dir"]}:{"int8" if EMBEDDING_CONFIG["onnx_quantized"] else "fp32"}'
+    return f'torch:{EMBEDDING_CONFIG["model_name"]}'
+
+def get_query_embedding(search_text):
+    """Embeds a search text, reusing the embedding of recent identical queries."""
+    return get_embedding(search_text, get_model_id(), get_sentence_embedding)
+
+def get_sentence_embeddings(sentences, batch_size=None):
+    """
+    Encodes many texts in batches and returns one float32 matrix, row i
+    holding the embedding of sentences[i].
+    Texts are grouped by length so each batch pads to a similar size.
+    """
+    model = get_model()
+    batch_size = batch_size or EMBEDDING_CONFIG["batch_size"]
+
+    embeddings = np.empty((len(sentences), model.get_sentence_embedding_dimension()), dtype=np.float32)
+    order = np.argsort([len(sentence) for sentence in sentences], kind="stable")
+
+    for start in range(0, len(order), batch_size):
+        batch = order[start:start + batch_size]
+        embeddings[batch] = model.encode(
+            [sentences[i] for i in batch],
+            batch_size=len(batch),
+            convert_to_numpy=True
+        )
+
+    return embeddings
+
+def count_tokens(text):
+    """Number of word pieces the embedding model sees for a text."""
+    return len(get_model().tokenizer.tokenize(text))
+
+def read_segments(file_path):
+    """Loads the Whisper segment timing saved next to a transcript, if any."""
+    segments_path = Path(file_path).with_suffix(".segments.json")
+    if not os.path.isfile(segments_path):
+        return None
+    with open(segments_path, 'r') as f:
+        return json.load(f)
+
+def move_processed(file_path, outputDir):
+    """Moves a transcript and its segment timing to the processed directory."""
+    for path in (Path(file_path), Path(file_path).with_suffix(".segments.json")):
+        if not os.path.isfile(path):
+            continue
+        if not os.path.isfile(os.path.join(outputDir, path.name)):
+            os.rename(path, os.path.join(outputDir, path.name))
+        else:
+            os.remove(path)
+
 def getOutputDir(outputDirectory):
     
     outputDir = Path(outputDirectory)
@@ -39,134 +103,270 @@ def getOutputDir(outputDirectory):
         os.makedirs(outputDir)
     return outputDir
     
-def read_files(inputDirectory, outputDirectory, topic=None):
-    
+def read_transcripts(inputDirectory):
+    """
+    Reads every transcript waiting in the input directory.
+    Returns dictionaries with file, file_path, video_id, text and content_hash.
+    """
     inputDir = Path(inputDirectory)
     
-    embeded_lst = []
+    transcripts = []
     
     if ( (not os.path.exists(inputDir)) or (not os.path.isdir(inputDir)) ):
-        return embeded_lst
-    
-    files = os.listdir(inputDir)
-    
-    if topic is None:
-        topic = os.path.basename(inputDir)
-
-    if len(files) <= 0:
-        return embeded_lst
+        return transcripts
     
-    outputDir = getOutputDir(outputDirectory)
-    
-    for file in files:
+    for file in os.listdir(inputDir):
         if file.endswith(".txt"):
             file_path = os.path.join(inputDir, file)
             
             if os.path.isfile(file_path):
                 
                 with open(file_path, 'r') as f:
-            
                     text = f.read()
-                    embedding = get_sentence_embedding(text)
-                    f.close()
+                
+                transcripts.append({
+                    "file": file,
+                    "file_path": file_path,
+                    "video_id": Path(file).stem,
+                    "text": text,
+                    "content_hash": content_hash(text)
+                })
+    
+    return transcripts
 
-                    if not os.path.isfile(os.path.join(outputDir, file)):
-                        os.rename(file_path, os.path.join(outputDir, file))
-                    else:
-                        os.remove(file_path)
-                        
-                    (topic_gen, summary, keypoints) = generate_combined_summary_and_key_points(text)
-                    
-                    if (topic_gen is not None): 
-                        topic += " - " + topic_gen
-                    
-                    embeded_lst.append(
-                        {
-                            "id" : str(uuid.uuid4().hex),
-                            "metadata": {
-                                'text':text,
-                                "topic": topic,
-                                "summary": summary,
-                                "keypoints":keypoints
-                                },
-                            "values": embedding.tolist()
-                        }
-                    )
+def embed_transcripts(transcripts, topic):
+    """
+    Chunks transcripts into passages, embeds all passages together and builds
+    upsert records with deterministic ids. Sets "ids" on each transcript.
+    """
+    embeded_lst = []
+    
+    for transcript in transcripts:
+        transcript["passages"] = chunk_transcript(transcript["text"], count_tokens, read_segments(transcript["file_path"]))
+    
+    passages = [passage for transcript in transcripts for passage in transcript["passages"]]
+    if len(passages) <= 0:
+        return embeded_lst
+    
+    embeddings = iter(get_sentence_embeddings([passage["text"] for passage in passages]).tolist())
+    
+    for transcript in transcripts:
+            
+        (topic_gen, summary, keypoints) = generate_combined_summary_and_key_points(transcript["text"])
+        
+        if (topic_gen is not None): 
+            topic += " - " + topic_gen
+        
+        transcript["ids"] = []
+        
+        for passage in transcript["passages"]:
+            metadata = {
+                'text': passage["text"],
+                "video_id": transcript["video_id"],
+                "chunk_index": passage["chunk_index"],
+                "start_char": passage["start_char"],
+                "topic": topic,
+                "summary": summary,
+                "keypoints":keypoints
+                }
+            if "start" in passage:
+                metadata["start"] = passage["start"]
+                metadata["end"] = passage["end"]
+            
+            transcript["ids"].append(vector_id(transcript["video_id"], passage["chunk_index"]))
+            embeded_lst.append(
+                {
+                    "id" : transcript["ids"][-1],
+                    "metadata": metadata,
+                    "values": next(embeddings)
+                }
+            )
                         
     return  embeded_lst
 
+def read_files(inputDirectory, outputDirectory, topic=None):
+    """
+    Builds upsert records for every transcript in the input directory.
+    Files are left in place; ingest_files moves them once they are written.
+    """
+    if topic is None:
+        topic = os.path.basename(Path(inputDirectory))
+    
+    return embed_transcripts(read_transcripts(inputDirectory), topic)
+
+def ingest_files(inputDirectory, outputDirectory, topic, index_name, namespace):
+    """
+    Embeds and upserts only new or changed transcripts, then moves each file
+    to the output directory once its vectors are confirmed written.
+    Unchanged transcripts are moved without any work.
+    Returns the save_to_database statistics.
+    """
+    if topic is None:
+        topic = os.path.basename(Path(inputDirectory))
+    
+    outputDir = getOutputDir(outputDirectory)
+    
+    changed = []
+    for transcript in read_transcripts(inputDirectory):
+        ingested = get_ingested(transcript["video_id"], index_name, namespace)
+        if ingested is not None and ingested[0] == transcript["content_hash"]:
+            move_processed(transcript["file_path"], outputDir)
+        else:
+            transcript["previous_count"] = ingested[1] if ingested is not None else 0
+            changed.append(transcript)
+    
+    embeded_lst = embed_transcripts(changed, topic)
+    stats = save_to_database(embeded_lst, index_name=index_name, namespace=namespace)
+    failed_ids = set(stats["failed_ids"])
+    
+    for transcript in changed:
+        if failed_ids.intersection(transcript["ids"]):
+            continue  # Left in the input directory for the next run
+        
+        # Remove passages of an older, longer version of the transcript
+        stale_ids = [
+            vector_id(transcript["video_id"], chunk_index)
+            for chunk_index in range(len(transcript["ids"]), transcript["previous_count"])
+        ]
+        if stale_ids:
+            runOnDatabaseIndex(index_name, lambda db_index: db_index.delete(ids=stale_ids, namespace=namespace))
+        
+        record_ingested(transcript["video_id"], transcript["content_hash"], len(transcript["ids"]), index_name, namespace)
+        move_processed(transcript["file_path"], outputDir)
+    
+    return stats
+
+def batch_vectors(embeded_lst, max_count=None, max_bytes=None):
+    """
+    Splits vectors into upsert batches bounded by record count and by the
+    approximate serialized request size.
+    """
+    max_count = max_count or UPSERT_CONFIG["batch_size"]
+    max_bytes = max_bytes or UPSERT_CONFIG["max_batch_bytes"]
+    
+    batches = []
+    batch = []
+    batch_bytes = 0
+    
+    for record in embeded_lst:
+        record_bytes = len(json.dumps(record))
+        
+        if batch and (len(batch) >= max_count or batch_bytes + record_bytes > max_bytes):
+            batches.append((batch, batch_bytes))
+            batch = []
+            batch_bytes = 0
+        
+        batch.append(record)
+        batch_bytes += record_bytes
+    
+    if batch:
+        batches.append((batch, batch_bytes))
+    
+    return batches
+
 def save_to_database(embeded_lst, index_name = 'test_videos' ,namespace="sample-namespace"):
+    """
+    Upserts vectors in size-bounded batches sent concurrently. Each batch is
+    retried on its own, so one failing batch does not abort the others.
+    Returns throughput statistics and the ids of vectors that were not written.
+    """
+    stats = {"vectors": 0, "bytes": 0, "seconds": 0.0, "failed_ids": []}
     
     if len(embeded_lst) > 0 :
-        db_index = getDatabaseIndex(index_name)
         
-        db_index.upsert(
-            vectors=embeded_lst,
-            namespace=namespace
-        )    
+        start = time.perf_counter()
+        
+        with ThreadPoolExecutor(max_workers=UPSERT_CONFIG["workers"]) as pool:
+            futures = {
+                pool.submit(runOnDatabaseIndex, index_name, lambda db_index, batch=batch: db_index.upsert(
+                    vectors=batch,
+                    namespace=namespace
+                )): (batch, batch_bytes)
+                for (batch, batch_bytes) in batch_vectors(embeded_lst)
+            }
+            
+            for future in as_completed(futures):
+                batch, batch_bytes = futures[future]
+                try:
+                    future.result()
+                    stats["vectors"] += len(batch)
+                    stats["bytes"] += batch_bytes
+                except Exception as e:
+                    print(f'Upsert of {len(batch)} vectors failed: {e}')
+                    stats["failed_ids"].extend(record["id"] for record in batch)
+        
+        stats["seconds"] = time.perf_counter() - start
+        seconds = max(stats["seconds"], 1e-9)
+        print(f'Upserted {stats["vectors"]} vectors ({stats["bytes"]} bytes) in {stats["seconds"]:.2f}s: '
+              f'{stats["vectors"] / seconds:.1f} vectors/s, {stats["bytes"] / seconds:.0f} bytes/s')
+    
+    return stats
 
 
 def embed_text_files(inputDir, outputDir, topic):
     
     return read_files(inputDirectory=inputDir, outputDirectory=outputDir, topic=topic)
 
-def configureApp(given_topic):
-    
-    global inputDir, outputDir, topic, db_index_name, db_namespace_name
-    
+def configureApp(given_topic, inputDirectory=None):
+    """
+    Builds the context of one ingest request. Requests keep their settings in
+    their own context, so several can run at the same time.
+    Args:
+        given_topic (str): Topic the transcripts belong to.
+        inputDirectory (str): Directory of transcripts to ingest, defaults to output/.
+    Returns:
+        dict: inputDir, outputDir, topic, db_index_name and db_namespace_name.
+    """
     currPath = Path.cwd()
     
-    inputDir = os.path.join( currPath, 'output')
-    outputDir = os.path.join(currPath, 'processed')
-    
-    topic = given_topic
-    db_index_name = 'samplevideos'
-    db_namespace_name="video-namespace"
+    context = {
+        "inputDir": inputDirectory or os.path.join(currPath, 'output'),
+        "outputDir": os.path.join(currPath, 'processed'),
+        "topic": given_topic,
+        "db_index_name": 'samplevideos',
+        "db_namespace_name": "video-namespace",
+    }
         
     load_dotenv(find_dotenv('Keys1.env'))
-    initialize_model()
+    get_model()
     getDatabase()
     
-    return True
+    return context
 
 def fetch_from_database(search_text, topics =[] ,top_k = 5, index_name = 'test-videos' ,namespace="sample-namespace"):
     
-    db_index = getDatabaseIndex(index_name)
+    vector = get_query_embedding(search_text).tolist()
     
-    results = db_index.query(namespace=namespace,
-        vector=np.array(get_sentence_embedding(search_text)).tolist(),
+    results = runOnDatabaseIndex(index_name, lambda db_index: db_index.query(namespace=namespace,
+        vector=vector,
         top_k=top_k,
         include_values=True,
         include_metadata=True,    
         filter={
             "topic": {"$in": topics},
         }                    
-    )
+    ))
     
     return results
 
-def captureData():
-    
-    global inputDir, outputDir, topic, db_index_name, db_namespace_name
-
-    embeded_lst = embed_text_files(inputDir, outputDir, topic)
+def captureData(context):
     
-    save_to_database(embeded_lst, index_name =db_index_name, namespace=db_namespace_name)
+    return ingest_files(context["inputDir"], context["outputDir"], context["topic"],
+                        index_name=context["db_index_name"], namespace=context["db_namespace_name"])
     
 
-def queryRepository(search_text, topic):
-    
-    global db_index_name, db_namespace_name
+def queryRepository(search_text, context):
     
-    result = fetch_from_database(search_text, topics=[topic], index_name = db_index_name, namespace=db_namespace_name)
+    result = fetch_from_database(search_text, topics=[context["topic"]],
+                                 index_name=context["db_index_name"], namespace=context["db_namespace_name"])
 
     print(f'Results: {result}')
     
 
-def mainApp(topic):
+def mainApp(topic, inputDirectory=None):
     
-    configureApp(topic)
-    captureData()
+    context = configureApp(topic, inputDirectory)
+    return captureData(context)
     
 
 if __name__ == "__main__":
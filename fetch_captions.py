@@ -0,0 +1,231 @@
+"""
+# Caption Fetching Module
+
+This module reads the captions YouTube already has for a video (manual or automatic) with
+yt-dlp and turns them into a plain-text transcript with timed segments, so most videos
+are transcribed with one small HTTP fetch instead of an audio download and Whisper.
+
+## Summary
+- Lists the caption tracks of a video without downloading any media
+- Prefers manual captions over automatic ones, in the configured language order
+- Only uses automatic captions in the language actually spoken, never YouTube's machine
+  translations of them
+- Parses YouTube's json3 caption format, falling back to WebVTT
+- Drops sound tags such as [Music] and the repeated lines of rolling automatic captions
+- Rejects tracks that look unusable (too few words per minute or too little of the
+  video covered), so Whisper is used instead
+
+## Dependencies
+
+### System Requirements
+- Python 3.8+
+- Internet connection
+
+### Package Dependencies
+1. **yt-dlp==2023.11.16**
+   - Install: `pip install yt-dlp`
+   - Purpose: Caption track listing and download
+
+### Project Dependencies
+1. config.py
+   - Provides CAPTION_CONFIG with:
+     - enabled
+     - languages
+     - allow_auto
+     - min_words_per_minute
+     - min_coverage
+
+2. download_audio.py
+   - Provides extract_info for the video metadata
+
+## Functions
+1. parse_json3(data) / parse_vtt(data)
+   - Return timed segments [{start, end, text}] from a caption file
+
+2. select_track(info)
+   - Returns (kind, language, formats) of the preferred caption track, or None
+   - Automatic tracks are taken from the "<language>-orig" entry yt-dlp lists for the
+     spoken language; the plain "<language>" entry of a video in another language is a
+     machine translation
+
+3. is_usable(segments, duration)
+   - Applies the quality heuristics
+
+4. fetch_captions(url, info=None)
+   - Returns a transcript built from captions, or None if Whisper should be used
+   - Takes the metadata from download_audio.extract_info, so the Whisper fallback can
+     reuse it instead of looking the video up twice
+
+## Returns
+fetch_captions() returns a dictionary with:
+- transcription: Plain text of the captions
+- segments: Timed segments (start, end, text) in seconds
+- language: Language code of the track
+- source: "captions:manual" or "captions:auto"
+
+## Error Handling
+- Returns None (fall back to Whisper) when captions are disabled, missing, rejected by
+  the heuristics, or cannot be downloaded or parsed
+"""
+
+import json
+import re
+import yt_dlp
+from config import CAPTION_CONFIG
+from download_audio import extract_info
+
+SOUND_TAG = re.compile(r"\[[^\]]*\]|\([^)]*(music|applause|laughter)[^)]*\)", re.IGNORECASE)
+VTT_TIME = re.compile(r"(?:(\d+):)?(\d{2}):(\d{2})\.(\d{3})\s+-->\s+(?:(\d+):)?(\d{2}):(\d{2})\.(\d{3})")
+VTT_TAG = re.compile(r"<[^>]+>")
+
+def clean_text(text):
+    """Removes sound tags and collapses whitespace."""
+    return " ".join(SOUND_TAG.sub(" ", text).split())
+
+def parse_json3(data):
+    """
+    Parses YouTube's json3 caption format.
+    Args:
+        data (str): File contents.
+    Returns:
+        list: Timed segments with start, end (seconds) and text.
+    """
+    segments = []
+    for event in json.loads(data).get("events", []):
+        text = clean_text("".join(seg.get("utf8", "") for seg in event.get("segs", [])))
+        if not text:
+            continue
+        start = event.get("tStartMs", 0) / 1000
+        segments.append({"start": start, "end": start + event.get("dDurationMs", 0) / 1000, "text": text})
+    return segments
+
+def vtt_seconds(hours, minutes, seconds, millis):
+    return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds) + int(millis) / 1000
+
+def parse_vtt(data):
+    """
+    Parses WebVTT captions. Automatic captions repeat the previous line in each cue
+    while new words roll in, so lines already seen in the previous cue are skipped.
+    Args:
+        data (str): File contents.
+    Returns:
+        list: Timed segments with start, end (seconds) and text.
+    """
+    segments = []
+    previous_lines = set()
+    for block in re.split(r"\n\s*\n", data.replace("\r\n", "\n")):
+        lines = block.strip().split("\n")
+        for position, line in enumerate(lines):
+            match = VTT_TIME.search(line)
+            if match:
+                break
+        else:
+            continue
+
+        cue_lines = [clean_text(VTT_TAG.sub("", text)) for text in lines[position + 1:]]
+        cue_lines = [text for text in cue_lines if text]
+        new_lines = [text for text in cue_lines if text not in previous_lines]
+        previous_lines = set(cue_lines)
+        if not new_lines:
+            continue
+
+        groups = match.groups()
+        segments.append({
+            "start": vtt_seconds(*groups[:4]),
+            "end": vtt_seconds(*groups[4:]),
+            "text": " ".join(new_lines),
+        })
+    return segments
+
+def is_spoken_language(info, language):
+    """Checks whether yt-dlp reports language as the language spoken in the video."""
+    spoken = info.get("language")
+    return bool(spoken) and spoken.split("-")[0] == language.split("-")[0]
+
+def select_track(info):
+    """
+    Picks the caption track to use.
+    Args:
+        info (dict): yt-dlp video info.
+    Returns:
+        tuple: (kind, language, formats) with kind "manual" or "auto", or None.
+    """
+    manual = info.get("subtitles") or {}
+    for language in CAPTION_CONFIG["languages"]:
+        if manual.get(language):
+            return "manual", language, manual[language]
+
+    if not CAPTION_CONFIG["allow_auto"]:
+        return None
+
+    # automatic_captions lists every language YouTube can translate to; the recognized
+    # speech itself is the "-orig" track. Without one, the plain track is only used when
+    # the video is known to be in that language.
+    automatic = info.get("automatic_captions") or {}
+    for language in CAPTION_CONFIG["languages"]:
+        if automatic.get(f"{language}-orig"):
+            return "auto", language, automatic[f"{language}-orig"]
+        if automatic.get(language) and is_spoken_language(info, language):
+            return "auto", language, automatic[language]
+    return None
+
+def is_usable(segments, duration):
+    """
+    Checks whether captions are complete enough to replace Whisper.
+    Args:
+        segments (list): Parsed caption segments.
+        duration (float): Video length in seconds, or None if unknown.
+    Returns:
+        bool: True if the captions pass the quality heuristics.
+    """
+    if not segments:
+        return False
+    if not duration:
+        return True
+
+    words = sum(len(segment["text"].split()) for segment in segments)
+    covered = segments[-1]["end"] - segments[0]["start"]
+    return (words / (duration / 60) >= CAPTION_CONFIG["min_words_per_minute"]
+            and covered / duration >= CAPTION_CONFIG["min_coverage"])
+
+def fetch_captions(url, info=None):
+    """
+    Builds a transcript from the captions of a video.
+    Args:
+        url (str): YouTube video URL.
+        info (dict): Metadata from extract_info. If None, it is looked up here.
+    Returns:
+        dict: Contains transcription, segments, language and source, or None when no
+        usable captions exist.
+    """
+    if not CAPTION_CONFIG["enabled"]:
+        return None
+
+    try:
+        if info is None:
+            info = extract_info(url)
+        with yt_dlp.YoutubeDL({'skip_download': True, 'quiet': True, 'no_warnings': True}) as ydl:
+            track = select_track(info)
+            if track is None:
+                return None
+            kind, language, formats = track
+
+            formats = {entry.get("ext"): entry["url"] for entry in formats if entry.get("url")}
+            if "json3" in formats:
+                segments = parse_json3(ydl.urlopen(formats["json3"]).read().decode("utf-8"))
+            elif "vtt" in formats:
+                segments = parse_vtt(ydl.urlopen(formats["vtt"]).read().decode("utf-8"))
+            else:
+                return None
+    except Exception:
+        return None
+
+    if not is_usable(segments, info.get("duration")):
+        return None
+
+    return {
+        "transcription": " ".join(segment["text"] for segment in segments),
+        "segments": segments,
+        "language": language,
+        "source": f"captions:{kind}",
+    }
@@ -38,12 +38,24 @@ This module is responsible for searching, filtering, and retrieving educational
    - keys1.env file with YouTube API key
    - YouTube Data API access enabled in Google Cloud Console
 
+## Functions
+1. fetch_video_details(youtube, video_ids)
+   - Looks up snippet, statistics and contentDetails in batches of up to 50 IDs
+   - Returns a dictionary of video records keyed by video ID
+
+2. fetch_videos(topic)
+   - Runs one search call plus one batched videos().list call per 50 hits
+   - Applies the FILTER_CONFIG filters and ranks by views
+
 ## Returns
 - List of dictionaries containing:
   - title: Video title
   - url: YouTube video URL
   - channel: Channel name
   - views: View count
+  - video_id: YouTube video ID
+  - duration: Video length in seconds
+  - has_captions: Whether the video has a caption track
 - Or error message string if fetch fails
 
 ## Error Handling
@@ -55,9 +67,64 @@ This module is responsible for searching, filtering, and retrieving educational
 """
 
 # Import Dependencies
+import re
 from googleapiclient.discovery import build
 from config import YOUTUBE_API_KEY, FILTER_CONFIG
 
+# videos().list accepts at most 50 comma-separated IDs per call
+VIDEOS_LIST_MAX_IDS = 50
+
+ISO_DURATION_PATTERN = re.compile(r"P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?")
+
+def parse_iso_duration(duration):
+    """
+    Converts an ISO 8601 duration (e.g. "PT12M31S") to seconds.
+    Args:
+        duration (str): Duration string from contentDetails.duration.
+    Returns:
+        int: Duration in seconds, 0 if the string cannot be parsed.
+    """
+    match = ISO_DURATION_PATTERN.fullmatch(duration or "")
+    if not match:
+        return 0
+    days, hours, minutes, seconds = (int(part or 0) for part in match.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+def fetch_video_details(youtube, video_ids):
+    """
+    Fetch snippet, statistics and contentDetails for many videos in batched calls.
+    Args:
+        youtube: YouTube API client built with googleapiclient.
+        video_ids (list): Video IDs to look up.
+    Returns:
+        dict: Maps video ID to a video record with parsed fields.
+    """
+    details = {}
+    for start in range(0, len(video_ids), VIDEOS_LIST_MAX_IDS):
+        batch = video_ids[start:start + VIDEOS_LIST_MAX_IDS]
+        response = youtube.videos().list(
+            part="snippet,statistics,contentDetails",
+            id=",".join(batch)
+        ).execute()
+
+        for item in response.get('items', []):
+            snippet = item.get('snippet', {})
+            stats = item.get('statistics', {})
+            content = item.get('contentDetails', {})
+            details[item['id']] = {
+                'video_id': item['id'],
+                'title': snippet.get('title', ''),
+                'description': snippet.get('description', ''),
+                'channel_id': snippet.get('channelId', ''),
+                'channel': snippet.get('channelTitle', ''),
+                'published_at': snippet.get('publishedAt', ''),
+                'views': int(stats.get('viewCount', 0)),
+                'likes': int(stats.get('likeCount', 0)),
+                'duration': parse_iso_duration(content.get('duration')),
+                'has_captions': content.get('caption') == "true",
+            }
+    return details
+
 def fetch_videos(topic):
     """Fetch relevant YouTube videos based on topic and filter criteria."""
     try:
@@ -73,22 +140,24 @@ def fetch_videos(topic):
             order=FILTER_CONFIG["order"]
         ).execute()
 
+        # Look up statistics for every search hit in as few calls as possible
+        search_items = search_response.get('items', [])
+        video_ids = [item['id']['videoId'] for item in search_items]
+        details = fetch_video_details(youtube, video_ids)
+        # Keyword scoring uses the search snippet (truncated description), as before;
+        # the full videos().list description would change which videos pass
+        search_snippets = {item['id']['videoId']: item['snippet'] for item in search_items}
+
         # Process video results
         videos = []
-        for item in search_response.get('items', []):
-            video_id = item['id']['videoId']
-            title = item['snippet']['title'].lower()
-            description = item['snippet']['description'].lower()
-            channel_id = item['snippet']['channelId']
-            
-            # Fetch video statistics (views)
-            stats_response = youtube.videos().list(
-                part="statistics",
-                id=video_id
-            ).execute()
-            
-            stats = stats_response.get('items', [{}])[0].get('statistics', {})
-            view_count = int(stats.get("viewCount", 0))
+        for video_id in video_ids:
+            record = details.get(video_id)
+            if record is None:
+                continue
+
+            title = search_snippets[video_id]['title'].lower()
+            description = search_snippets[video_id]['description'].lower()
+            view_count = record['views']
             
             # Apply filters: minimum views, keywords, trusted channels
             if view_count < FILTER_CONFIG["min_view_count"]:
@@ -98,14 +167,17 @@ def fetch_videos(topic):
             noise_score = len(set(title.split() + description.split()) & FILTER_CONFIG["non_teaching_keywords"])
             # noise_score = len(set(title.split() + description.split()) & FILTER_CONFIG["blocked_keywords"])
             
-            is_trusted_channel = channel_id in FILTER_CONFIG["trusted_channels"].values()
+            is_trusted_channel = record['channel_id'] in FILTER_CONFIG["trusted_channels"].values()
             
             if teaching_score > noise_score or is_trusted_channel:
                 videos.append({
-                    'title': item['snippet']['title'],
+                    'title': record['title'],
                     'url': f'https://youtu.be/{video_id}',
-                    'channel': item['snippet']['channelTitle'],
+                    'channel': record['channel'],
                     'views': view_count,
+                    'video_id': video_id,
+                    'duration': record['duration'],
+                    'has_captions': record['has_captions'],
                 })
 
         # Sort by views (descending) and return top 3 videos
@@ -0,0 +1,135 @@
+"""
+# Ingest Manifest Module
+
+This module records which transcripts have been written to the vector database, so ingest
+only embeds new or changed transcripts and re-runs on unchanged data do no work.
+
+## Summary
+- Tracks each video per (index, namespace) with the SHA-256 hash of its transcript
+- Stores how many passage vectors were written, so stale passages can be deleted
+- Builds deterministic vector IDs from the video ID and passage position
+- Uses a SQLite file that is safe to share between processes
+
+## Dependencies
+
+### System Requirements
+- Python 3.8+
+
+### Package Dependencies
+No additional package installations required beyond project dependencies
+
+### Project Dependencies
+1. config.py
+   - Provides INGEST_CONFIG with:
+     - manifest_path
+
+## Functions
+1. content_hash(text)
+   - Returns the SHA-256 hex digest of a transcript
+
+2. vector_id(video_id, chunk_index)
+   - Returns the deterministic ID of a passage vector
+
+3. get_ingested(video_id, index_name, namespace)
+   - Returns (content_hash, vector_count) of the last confirmed write, or None
+
+4. record_ingested(video_id, content_hash, vector_count, index_name, namespace)
+   - Records a confirmed write
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from config import INGEST_CONFIG
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingested (
+    index_name TEXT NOT NULL,
+    namespace TEXT NOT NULL,
+    video_id TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    vector_count INTEGER NOT NULL,
+    ingested_at REAL NOT NULL,
+    PRIMARY KEY (index_name, namespace, video_id)
+)
+"""
+
+def get_connection():
+    """
+    Opens a connection to the manifest database, creating it if needed.
+    Returns:
+        sqlite3.Connection: Connection in autocommit mode.
+    """
+    path = INGEST_CONFIG["manifest_path"]
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute(SCHEMA)
+    return connection
+
+def content_hash(text):
+    """
+    Hashes transcript text.
+    Args:
+        text (str): Transcript text.
+    Returns:
+        str: SHA-256 hex digest.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def vector_id(video_id, chunk_index):
+    """
+    Builds the ID of a passage vector. Re-ingesting a video overwrites its
+    vectors instead of adding duplicates.
+    Args:
+        video_id (str): YouTube video ID.
+        chunk_index (int): Position of the passage in the transcript.
+    Returns:
+        str: Vector ID.
+    """
+    return f"{video_id}-{chunk_index}"
+
+def get_ingested(video_id, index_name, namespace):
+    """
+    Looks up the last confirmed write of a video.
+    Args:
+        video_id (str): YouTube video ID.
+        index_name (str): Vector index name.
+        namespace (str): Vector namespace.
+    Returns:
+        tuple: (content_hash, vector_count), or None if never ingested.
+    """
+    connection = get_connection()
+    try:
+        return connection.execute(
+            "SELECT content_hash, vector_count FROM ingested "
+            "WHERE index_name = ? AND namespace = ? AND video_id = ?",
+            (index_name, namespace, video_id)
+        ).fetchone()
+    finally:
+        connection.close()
+
+def record_ingested(video_id, content_hash, vector_count, index_name, namespace):
+    """
+    Records that a video's vectors were written.
+    Args:
+        video_id (str): YouTube video ID.
+        content_hash (str): Hash of the ingested transcript.
+        vector_count (int): Number of passage vectors written.
+        index_name (str): Vector index name.
+        namespace (str): Vector namespace.
+    """
+    connection = get_connection()
+    try:
+        connection.execute(
+            "INSERT OR REPLACE INTO ingested "
+            "(index_name, namespace, video_id, content_hash, vector_count, ingested_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (index_name, namespace, video_id, content_hash, vector_count, time.time())
+        )
+    finally:
+        connection.close()
@@ -0,0 +1,348 @@
+"""
+# Approximate Nearest Neighbour Module (IVF)
+
+This module adds an inverted-file (IVF) index on top of the local vector store, so a
+query only scores the vectors in the few clusters closest to it instead of the whole
+matrix. Recall is traded against latency with nprobe, the number of clusters searched.
+
+## Summary
+- Trains cluster centroids with spherical k-means on a sample of stored vectors
+- Assigns every vector to its nearest centroid; new upserts are assigned incrementally
+- Reconciles the assignments with the matrix, assigning rows an interrupted upsert
+  left out and dropping entries past its end
+- Groups rows by cluster lazily: rows added or moved since the last grouping are
+  searched from a small overflow list until it grows past REBUILD_FRACTION
+- Searches the nprobe nearest clusters and returns their rows as candidates
+- Saves centroids (.npy) and assignments (raw int32) and reopens them with mmap
+- Measures recall@k and latency against exact search over a sweep of nlist and nprobe,
+  on real transcript embeddings or on isotropic and overlapping synthetic vectors
+  (run this module to benchmark)
+
+## Dependencies
+
+### System Requirements
+- Python 3.8+
+
+### Package Dependencies
+1. **numpy**
+   - Install: `pip install numpy`
+   - Purpose: Clustering and candidate selection
+
+### Project Dependencies
+1. config.py
+   - Provides VECTOR_STORE_CONFIG with:
+     - nlist
+     - nprobe
+     - ann_min_vectors
+
+## Classes
+IVFIndex(path, dimension)
+- is_trained(): Whether centroids exist
+- train(matrix): Builds centroids and assigns all rows
+- reconcile(matrix): Makes the assignments cover exactly the rows of the matrix
+- add(rows, vectors): Assigns new or updated rows
+- search(query, nprobe): Candidate rows for a query
+
+## Functions
+measure_recall(index, queries, top_k, namespace, nprobe)
+- Returns recall@k of the IVF search against exact search and mean latencies
+
+## Usage
+```
+python ivf_index.py [transcript directory]
+```
+With a directory, its transcripts are chunked and embedded with the configured model;
+without one, synthetic data is used.
+"""
+
+import os
+import threading
+import time
+import numpy as np
+from config import VECTOR_STORE_CONFIG
+
+KMEANS_ITERATIONS = 10
+ASSIGN_BATCH = 65536
+
+# Cluster lists are rebuilt once rows added or moved since the last build exceed this
+# share of the indexed rows (or REBUILD_MIN rows, whichever is larger)
+REBUILD_FRACTION = 0.05
+REBUILD_MIN = 1024
+
+def nearest_centroids(vectors, centroids):
+    """Returns the index of the most similar centroid for each (normalised) vector."""
+    assignments = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), ASSIGN_BATCH):
+        batch = np.asarray(vectors[start:start + ASSIGN_BATCH], dtype=np.float32)
+        assignments[start:start + ASSIGN_BATCH] = np.argmax(batch @ centroids.T, axis=1)
+    return assignments
+
+def spherical_kmeans(sample, nlist, seed=0):
+    """Clusters unit vectors by cosine similarity and returns unit-length centroids."""
+    rng = np.random.default_rng(seed)
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+    for _ in range(KMEANS_ITERATIONS):
+        assignments = nearest_centroids(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, sample)
+
+        # Reseed clusters that lost all their members
+        empty = np.flatnonzero(np.bincount(assignments, minlength=nlist) == 0)
+        sums[empty] = sample[rng.choice(len(sample), len(empty), replace=False)]
+
+        centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+    return centroids.astype(np.float32)
+
+class IVFIndex:
+    """Inverted-file index over the rows of one namespace of a LocalIndex."""
+
+    def __init__(self, path, dimension):
+        self.centroids_path = path + ".ivf.centroids.npy"
+        self.assignments_path = path + ".ivf.assign"
+        self.dimension = dimension
+        self.centroids = None
+        self.lists = None
+        self.lists_count = 0
+        self.moved = set()
+        # Guards lists, lists_count and moved between searching threads and add()
+        self.lock = threading.Lock()
+
+        if os.path.isfile(self.centroids_path):
+            self.centroids = np.load(self.centroids_path, mmap_mode='r')
+
+    def is_trained(self):
+        return self.centroids is not None
+
+    def get_assignments(self, mode='r'):
+        if mode == 'r' and self.count() == 0:
+            return np.zeros(0, dtype=np.int32)
+        return np.memmap(self.assignments_path, dtype=np.int32, mode=mode, shape=(self.count(),))
+
+    def count(self):
+        """Number of complete entries in the assignment file."""
+        if not os.path.isfile(self.assignments_path):
+            return 0
+        return os.path.getsize(self.assignments_path) // 4
+
+    def reconcile(self, matrix):
+        """
+        Makes the assignments cover exactly the rows of the matrix. Rows missing after an
+        interrupted upsert are assigned; entries past the end of the matrix, or a partly
+        written entry, are dropped.
+        Args:
+            matrix (numpy.ndarray): Normalised vectors of the namespace.
+        """
+        count = self.count()
+        size = os.path.getsize(self.assignments_path) if os.path.isfile(self.assignments_path) else 0
+        if count == len(matrix) and size == count * 4:
+            return
+
+        if count > len(matrix) or size != count * 4:
+            count = min(count, len(matrix))
+            with open(self.assignments_path, "ab") as file:
+                file.truncate(count * 4)
+        if count < len(matrix):
+            assignments = nearest_centroids(matrix[count:], np.asarray(self.centroids))
+            with open(self.assignments_path, "ab") as file:
+                file.write(assignments.tobytes())
+        with self.lock:
+            self.lists = None
+
+    def train(self, matrix):
+        """
+        Trains centroids on a sample of the matrix and assigns every row.
+        Args:
+            matrix (numpy.ndarray): Normalised vectors of the namespace.
+        """
+        nlist = min(VECTOR_STORE_CONFIG["nlist"], len(matrix))
+        rng = np.random.default_rng(0)
+        sample_size = min(len(matrix), nlist * 64)
+        sample = np.asarray(matrix[np.sort(rng.choice(len(matrix), sample_size, replace=False))], dtype=np.float32)
+
+        centroids = spherical_kmeans(sample, nlist)
+        assignments = nearest_centroids(matrix, centroids)
+
+        assignments.tofile(self.assignments_path)
+        np.save(self.centroids_path, centroids)
+        self.centroids = np.load(self.centroids_path, mmap_mode='r')
+        with self.lock:
+            self.lists = None
+            self.moved = set()
+
+    def add(self, rows, vectors):
+        """
+        Assigns new or overwritten rows to their nearest cluster.
+        Args:
+            rows (list): Row numbers in the namespace matrix.
+            vectors (numpy.ndarray): Normalised vectors for those rows.
+        """
+        # A row written twice in one upsert keeps its last vector
+        rows = np.asarray(rows, dtype=np.int64)
+        rows, last = np.unique(rows[::-1], return_index=True)
+        vectors = vectors[len(vectors) - 1 - last]
+        assignments = nearest_centroids(vectors, np.asarray(self.centroids))
+
+        count = self.count()
+        new = rows >= count
+        if new.any():
+            # Rows are appended in order, so new rows extend the file contiguously
+            if rows[new][0] != count:
+                raise ValueError(f"Assignments cover {count} rows, cannot append row {rows[new][0]}")
+            with open(self.assignments_path, "ab") as file:
+                file.write(assignments[new].tobytes())
+        if (~new).any():
+            stored = self.get_assignments('r+')
+            changed = stored[rows[~new]] != assignments[~new]
+            stored[rows[~new]] = assignments[~new]
+            stored.flush()
+            del stored
+            # Searched from the overflow until the next rebuild (new rows are found by count)
+            with self.lock:
+                self.moved.update(rows[~new][changed].tolist())
+
+    def get_lists(self, assignments):
+        """
+        Groups rows by cluster. The grouping is rebuilt only once the rows added or moved
+        since it was built pass REBUILD_FRACTION, or when the assignment file shrank.
+        Returns:
+            tuple: (rows sorted by cluster, start offset of each cluster, rows covered by
+            the grouping, rows moved since it was built).
+        """
+        with self.lock:
+            changed = len(assignments) - self.lists_count + len(self.moved)
+            if (self.lists is None or len(assignments) < self.lists_count
+                    or changed > max(REBUILD_MIN, REBUILD_FRACTION * self.lists_count)):
+                grouped = np.asarray(assignments)
+                order = np.argsort(grouped, kind="stable")
+                offsets = np.concatenate(([0], np.cumsum(np.bincount(grouped, minlength=len(self.centroids)))))
+                self.lists = (order, offsets)
+                self.lists_count = len(grouped)
+                self.moved = set()
+            moved = np.fromiter(self.moved, dtype=np.int64, count=len(self.moved))
+            return self.lists + (self.lists_count, moved)
+
+    def search(self, query, nprobe=None):
+        """
+        Finds the rows stored in the clusters closest to a query.
+        Args:
+            query (numpy.ndarray): Normalised query vector.
+            nprobe (int): Clusters to search, defaults to VECTOR_STORE_CONFIG["nprobe"].
+        Returns:
+            numpy.ndarray: Candidate row numbers.
+        """
+        nprobe = min(nprobe or VECTOR_STORE_CONFIG["nprobe"], len(self.centroids))
+        assignments = self.get_assignments()
+        order, offsets, lists_count, moved = self.get_lists(assignments)
+
+        probes = np.argpartition(-(np.asarray(self.centroids) @ query), nprobe - 1)[:nprobe]
+        candidates = np.concatenate([order[offsets[probe]:offsets[probe + 1]] for probe in probes])
+
+        # Rows added or moved since the lists were built, kept if now in a probed cluster;
+        # listed rows that moved out of the probed clusters are dropped
+        overflow = np.arange(lists_count, len(assignments))
+        if len(moved):
+            candidates = np.union1d(candidates, np.concatenate((overflow, moved)))
+        else:
+            candidates = np.concatenate((candidates, overflow))
+        probed = np.zeros(len(self.centroids), dtype=bool)
+        probed[probes] = True
+        return candidates[probed[assignments[candidates]]]
+
+def measure_recall(index, queries, top_k=10, namespace="", nprobe=None):
+    """
+    Compares IVF search with exact search on a LocalIndex.
+    Args:
+        index (LocalIndex): Index with a trained IVF layer.
+        queries (numpy.ndarray): Query vectors.
+        top_k (int): Number of neighbours compared.
+        namespace (str): Namespace to search.
+        nprobe (int): Clusters searched by the IVF query.
+    Returns:
+        dict: recall@k, mean exact latency and mean IVF latency in milliseconds.
+    """
+    hits = 0
+    exact_time = 0.0
+    ann_time = 0.0
+    for query in queries:
+        start = time.perf_counter()
+        exact = index.query(query, top_k=top_k, namespace=namespace, exact=True)
+        exact_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        approximate = index.query(query, top_k=top_k, namespace=namespace, nprobe=nprobe)
+        ann_time += time.perf_counter() - start
+
+        expected = {match["id"] for match in exact["matches"]}
+        hits += len(expected & {match["id"] for match in approximate["matches"]})
+
+    return {
+        "recall": hits / (len(queries) * top_k),
+        "exact_ms": 1000 * exact_time / len(queries),
+        "ann_ms": 1000 * ann_time / len(queries),
+    }
+
+def build_index(directory, vectors, nlist):
+    """Loads vectors into a new LocalIndex in directory, training an IVF index of nlist clusters."""
+    from localdb import LocalIndex
+
+    VECTOR_STORE_CONFIG.update(ann=True, nlist=nlist, ann_min_vectors=len(vectors))
+    index = LocalIndex(directory, vectors.shape[1])
+    for start in range(0, len(vectors), 10000):
+        index.upsert([
+            {"id": str(row), "values": vectors[row]}
+            for row in range(start, min(start + 10000, len(vectors)))
+        ])
+    return index
+
+def load_transcript_embeddings(directory):
+    """Embeds the passages of the transcripts (.txt) in a directory with the configured model."""
+    from chunk_transcripts import chunk_transcript
+    from embeddings import count_tokens, get_sentence_embeddings, read_segments, read_transcripts
+
+    passages = [
+        passage["text"]
+        for transcript in read_transcripts(directory)
+        for passage in chunk_transcript(transcript["text"], count_tokens, read_segments(transcript["file_path"]))
+    ]
+    return np.asarray(get_sentence_embeddings(passages), dtype=np.float32)
+
+def synthetic_datasets(count, dimension, rng):
+    """Harder stand-ins for passage embeddings than well separated clusters."""
+    centers = rng.normal(size=(200, dimension))
+    return {
+        # No cluster structure at all: the worst case for IVF
+        "isotropic": rng.normal(size=(count, dimension)),
+        # Topics whose spread is larger than the distance between them
+        "overlapping": centers[rng.integers(0, len(centers), count)] + 3.0 * rng.normal(size=(count, dimension)),
+    }
+
+if __name__ == "__main__":
+    import sys
+    import tempfile
+
+    # python ivf_index.py [transcript directory]: real passage embeddings if given
+    rng = np.random.default_rng(42)
+    if len(sys.argv) > 1:
+        datasets = {"transcripts": load_transcript_embeddings(sys.argv[1])}
+    else:
+        datasets = synthetic_datasets(200000, VECTOR_STORE_CONFIG["dimension"], rng)
+
+    default_nlist = VECTOR_STORE_CONFIG["nlist"]
+    for name, vectors in datasets.items():
+        # Queries are held-out vectors of the same distribution
+        order = rng.permutation(len(vectors))
+        queries, vectors = vectors[order[:200]], vectors[order[200:]]
+        print(f"{name}: {len(vectors)} vectors, {len(queries)} queries")
+
+        # Small collections cannot fill the default number of clusters
+        nlists = sorted({max(1, min(nlist, len(vectors) // 39)) for nlist in (default_nlist // 4, default_nlist, default_nlist * 4)})
+        for nlist in nlists:
+            with tempfile.TemporaryDirectory() as directory:
+                index = build_index(directory, vectors, nlist)
+                for nprobe in (1, 4, 16, 32, 64, 128):
+                    if nprobe > nlist:
+                        break
+                    result = measure_recall(index, queries, top_k=10, nprobe=nprobe)
+                    print(f"  nlist={nlist:5d} nprobe={nprobe:3d} recall@10={result['recall']:.3f} "
+                          f"exact={result['exact_ms']:.2f} ms ivf={result['ann_ms']:.2f} ms")
@@ -0,0 +1,165 @@
+"""
+# LLM Response Cache Module
+
+This module stores Gemini responses keyed by model, prompt template version and a hash of
+the prompt inputs, so identical requests for the same videos are answered from disk
+instead of being paid for again.
+
+## Summary
+- Persists responses in a SQLite file shared by every worker process
+- Expires entries after a time-to-live and evicts the least recently used beyond a limit
+- Counts hits and misses per process for monitoring
+
+## Dependencies
+
+### System Requirements
+- Python 3.8+
+
+### Package Dependencies
+No additional package installations required beyond project dependencies
+
+### Project Dependencies
+1. config.py
+   - Provides LLM_CACHE_CONFIG with:
+     - path
+     - ttl_seconds
+     - max_entries
+
+## Functions
+1. make_key(model, template_version, inputs)
+   - Returns the cache key for a request
+
+2. get_response(key)
+   - Returns the cached response text, or None
+
+3. put_response(key, response, model, template_version)
+   - Stores a response and runs eviction
+
+4. get_cache_stats()
+   - Returns hits, misses and hit rate since the process started
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from config import LLM_CACHE_CONFIG
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT,
+    template_version TEXT,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+)
+"""
+
+stats = {"hits": 0, "misses": 0}
+stats_lock = threading.Lock()
+
+def get_connection():
+    """
+    Opens a connection to the cache database, creating it if needed.
+    Returns:
+        sqlite3.Connection: Connection in autocommit mode.
+    """
+    path = LLM_CACHE_CONFIG["path"]
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute(SCHEMA)
+    return connection
+
+def make_key(model, template_version, inputs):
+    """
+    Builds a cache key.
+    Args:
+        model (str): LLM model name.
+        template_version (str): Version of the prompt template.
+        inputs: JSON-serialisable prompt inputs (e.g. list of transcripts).
+    Returns:
+        str: SHA-256 hex digest.
+    """
+    payload = json.dumps([model, template_version, inputs], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def record(hit):
+    with stats_lock:
+        stats["hits" if hit else "misses"] += 1
+
+def get_response(key):
+    """
+    Looks up a cached response.
+    Args:
+        key (str): Key from make_key.
+    Returns:
+        str: Response text, or None if missing or expired.
+    """
+    now = time.time()
+
+    connection = get_connection()
+    try:
+        row = connection.execute(
+            "SELECT response FROM responses WHERE key = ? AND created_at >= ?",
+            (key, now - LLM_CACHE_CONFIG["ttl_seconds"])
+        ).fetchone()
+
+        if row is not None:
+            connection.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+    finally:
+        connection.close()
+
+    record(row is not None)
+    return row[0] if row is not None else None
+
+def put_response(key, response, model=None, template_version=None):
+    """
+    Stores a response, then drops expired and least recently used entries.
+    Args:
+        key (str): Key from make_key.
+        response (str): Response text.
+        model (str): LLM model name.
+        template_version (str): Version of the prompt template.
+    """
+    now = time.time()
+
+    connection = get_connection()
+    try:
+        connection.execute(
+            "INSERT OR REPLACE INTO responses "
+            "(key, model, template_version, response, created_at, last_access) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, model, template_version, response, now, now)
+        )
+        connection.execute(
+            "DELETE FROM responses WHERE created_at < ?",
+            (now - LLM_CACHE_CONFIG["ttl_seconds"],)
+        )
+        connection.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (LLM_CACHE_CONFIG["max_entries"],)
+        )
+    finally:
+        connection.close()
+
+def get_cache_stats():
+    """
+    Returns cache metrics for this process.
+    Returns:
+        dict: hits, misses and hit_rate.
+    """
+    with stats_lock:
+        total = stats["hits"] + stats["misses"]
+        return {
+            "hits": stats["hits"],
+            "misses": stats["misses"],
+            "hit_rate": stats["hits"] / total if total else 0.0,
+        }
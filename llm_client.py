@@ -0,0 +1,152 @@
+"""
+# Shared Gemini Client Module
+
+This module builds Gemini chat clients once per configuration and reuses them, so each
+request does not pay for loading environment files, validating keys and opening new
+connections.
+
+## Summary
+- Loads keys1.env once, at import
+- Caches one ChatGoogleGenerativeAI client per (model, temperature, top_p, max_output_tokens)
+- Shares each client (and its underlying connection) across threads and requests
+- Offers synchronous predict() and asynchronous apredict() helpers
+- Streams responses with stream() and splits them into sections in a single pass
+  with parse_sections(), so callers can show each section as soon as it is complete
+
+## Dependencies
+
+### System Requirements
+- Python 3.8+
+- Internet connection for API calls
+
+### Package Dependencies
+1. **langchain-google-genai**
+   - Install: `pip install langchain-google-genai`
+   - Purpose: Interface with Gemini AI model
+
+2. **python-dotenv**
+   - Install: `pip install python-dotenv`
+   - Purpose: Load environment variables
+
+### Project Dependencies
+1. **keys1.env file**
+   - Must contain: GEMINI_API_KEY
+
+## Functions
+1. get_llm(model, temperature, top_p, max_output_tokens)
+   - Returns the shared client for a configuration
+
+2. predict(llm, prompt)
+   - Returns the response text
+
+3. apredict(llm, prompt)
+   - Awaitable version of predict() built on ainvoke, for use under asyncio
+
+4. stream(llm, prompt)
+   - Yields the response text piece by piece as it arrives
+
+5. parse_sections(chunks, headers)
+   - Yields (name, text) for each section of a (streamed) response once the next
+     section starts or the response ends
+"""
+
+import itertools
+import os
+import threading
+from dotenv import load_dotenv, find_dotenv
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+# Load environment variables
+load_dotenv(find_dotenv('keys1.env'))
+
+GEMINI_MODEL = "gemini-1.5-flash"
+
+clients = {}
+clients_lock = threading.Lock()
+
+def get_llm(model=GEMINI_MODEL, temperature=None, top_p=None, max_output_tokens=None):
+    """
+    Returns a shared Gemini client, creating it on first use.
+    Args:
+        model (str): Gemini model name.
+        temperature (float): Sampling temperature, model default if None.
+        top_p (float): Nucleus sampling, model default if None.
+        max_output_tokens (int): Response length limit, model default if None.
+    Returns:
+        ChatGoogleGenerativeAI: Client for the configuration.
+    """
+    key = (model, temperature, top_p, max_output_tokens)
+
+    llm = clients.get(key)
+    if llm is None:
+        with clients_lock:
+            llm = clients.get(key)
+            if llm is None:
+                options = {"temperature": temperature, "top_p": top_p, "max_output_tokens": max_output_tokens}
+                llm = ChatGoogleGenerativeAI(
+                    model=model,
+                    google_api_key=os.getenv("GEMINI_API_KEY"),
+                    **{name: value for name, value in options.items() if value is not None}
+                )
+                clients[key] = llm
+    return llm
+
+def predict(llm, prompt):
+    """
+    Sends a prompt and returns the response text.
+    """
+    return llm.predict(prompt)
+
+async def apredict(llm, prompt):
+    """
+    Sends a prompt without blocking the event loop and returns the response text.
+    """
+    message = await llm.ainvoke(prompt)
+    return message.content
+
+def stream(llm, prompt):
+    """
+    Sends a prompt and yields the response text as it arrives.
+    """
+    for chunk in llm.stream(prompt):
+        yield chunk.content
+
+def parse_sections(chunks, headers, preamble=None):
+    """
+    Splits a response into sections in one pass over its text. A section starts at a line
+    matching one of the header patterns and is yielded as soon as the next one starts.
+    Args:
+        chunks (iterable): Response text in pieces, e.g. from stream().
+        headers (dict): Section name -> compiled pattern matched at the start of a line.
+            The matched text is dropped; use a lookahead to keep it.
+        preamble: Name to yield non-empty text before the first header under. If None,
+            that text is ignored.
+    Yields:
+        tuple: (name, text) with surrounding whitespace stripped.
+    """
+    name = preamble
+    lines = []
+    pending = ""
+
+    for chunk in itertools.chain(chunks, [None]):
+        if chunk is None:
+            complete, pending = [pending], ""
+        else:
+            # Only whole lines are matched; the unfinished last line waits for more text
+            *complete, pending = (pending + chunk).split("\n")
+
+        for line in complete:
+            for header, pattern in headers.items():
+                match = pattern.match(line)
+                if match:
+                    text = "\n".join(lines).strip()
+                    if name is not None and (text or name != preamble):
+                        yield name, text
+                    name, lines = header, [line[match.end():]]
+                    break
+            else:
+                lines.append(line)
+
+    text = "\n".join(lines).strip()
+    if name is not None and (text or name != preamble):
+        yield name, text
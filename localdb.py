@@ -0,0 +1,421 @@
+"""
+# Local Vector Index Module
+
+This module provides an in-process vector index with the same upsert/query call shapes as a
+Pinecone Index, so the retrieval path can run offline and without network round trips.
+
+## Summary
+- Stores vectors as a memory-mapped float32 matrix per namespace
+- Stores ids and metadata in a SQLite table next to the matrix
+- Marks deleted rows in a tombstone file (one byte per row), so searches skip them
+  before picking the top k
+- Exact top-k cosine search with NumPy, or IVF approximate search on large
+  namespaces (see ivf_index.py)
+- Supports Pinecone-style metadata filters ($eq, $ne, $in, $nin)
+- Persists to disk and reopens existing data on startup
+
+## Dependencies
+
+### System Requirements
+- Python 3.8+
+- SQLite with the JSON1 extension (bundled with Python)
+
+### Package Dependencies
+1. **numpy**
+   - Install: `pip install numpy`
+   - Purpose: Vector storage and similarity search
+
+### Project Dependencies
+1. config.py
+   - Provides VECTOR_STORE_CONFIG with:
+     - ann
+     - ann_min_vectors
+
+2. ivf_index.py
+   - Approximate nearest-neighbour layer
+
+## Classes
+LocalIndex(path, dimension)
+- upsert(vectors, namespace): Inserts or replaces {"id", "values", "metadata"} records
+- delete(ids, namespace): Removes records by id
+- query(vector, top_k, namespace, include_values, include_metadata, filter, nprobe, exact): Top-k search
+
+## Returns
+query() returns a dictionary shaped like a Pinecone query response:
+- matches: List of {"id", "score", "values", "metadata"} sorted by score
+- namespace: Namespace that was searched
+
+## Notes
+- Vectors are L2-normalised when stored, so returned values are unit length
+- A single process should write to an index at a time; any number may read. Readers
+  map only the rows whose metadata is committed, and the writer truncates rows left
+  behind by a failed upsert before appending
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import numpy as np
+from config import VECTOR_STORE_CONFIG
+from ivf_index import IVFIndex
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vectors (
+    namespace TEXT NOT NULL,
+    id TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    metadata TEXT NOT NULL,
+    PRIMARY KEY (namespace, id)
+);
+CREATE INDEX IF NOT EXISTS vectors_row ON vectors (namespace, row);
+CREATE TABLE IF NOT EXISTS namespaces (
+    namespace TEXT PRIMARY KEY,
+    rows INTEGER NOT NULL
+);
+"""
+
+FILTER_OPERATORS = {"$eq": "=", "$ne": "!="}
+
+def build_filter(filter):
+    """
+    Translates a Pinecone-style metadata filter into a SQL condition.
+    Args:
+        filter (dict): e.g. {"topic": {"$in": ["a", "b"]}} or {"video_id": "abc"}.
+    Returns:
+        tuple: (sql condition, parameters).
+    """
+    conditions = []
+    parameters = []
+    for field, condition in (filter or {}).items():
+        path = '$."' + field.replace('"', '') + '"'
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+
+        for operator, value in condition.items():
+            if operator in ("$in", "$nin"):
+                placeholders = ", ".join("?" for _ in value) or "NULL"
+                negate = "NOT " if operator == "$nin" else ""
+                conditions.append(f"json_extract(metadata, ?) {negate}IN ({placeholders})")
+                parameters.extend([path, *value])
+            elif operator in FILTER_OPERATORS:
+                conditions.append(f"json_extract(metadata, ?) {FILTER_OPERATORS[operator]} ?")
+                parameters.extend([path, value])
+            else:
+                raise ValueError(f"Unsupported filter operator: {operator}")
+
+    return " AND ".join(conditions) or "1", parameters
+
+class LocalIndex:
+    """Vector index stored on local disk, queried with exact cosine similarity."""
+
+    def __init__(self, path, dimension):
+        self.path = path
+        self.dimension = dimension
+        self.lock = threading.Lock()
+        self.matrices = {}
+        self.tombstones = {}
+        self.anns = {}
+        self.anns_lock = threading.Lock()
+        self.connections = threading.local()
+        os.makedirs(path, exist_ok=True)
+
+    def connect(self):
+        """Returns this thread's connection to the metadata table, opening it on first use."""
+        connection = getattr(self.connections, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(os.path.join(self.path, "metadata.db"), timeout=30)
+            connection.executescript(SCHEMA)
+            self.connections.connection = connection
+        return connection
+
+    def get_ann(self, namespace):
+        """Returns the namespace's IVF index, or None when ANN search is disabled."""
+        if not VECTOR_STORE_CONFIG["ann"]:
+            return None
+        with self.anns_lock:
+            if namespace not in self.anns:
+                self.anns[namespace] = IVFIndex(os.path.join(self.path, namespace or 'default'), self.dimension)
+            return self.anns[namespace]
+
+    def vectors_path(self, namespace):
+        return os.path.join(self.path, f"{namespace or 'default'}.f32")
+
+    def committed_rows(self, namespace):
+        """
+        Returns the number of rows whose metadata is committed. The vectors file may be
+        longer while an upsert is appending, or after one failed before committing.
+        """
+        stored = self.connect().execute("SELECT rows FROM namespaces WHERE namespace = ?", (namespace,)).fetchone()
+        if stored is not None:
+            return stored[0]
+
+        # Stores written before the count was recorded: every complete row of the file
+        vectors_path = self.vectors_path(namespace)
+        size = os.path.getsize(vectors_path) if os.path.isfile(vectors_path) else 0
+        return size // (4 * self.dimension)
+
+    def get_matrix(self, namespace):
+        """Returns the namespace's committed vectors as a read-only memory map, reopening it after writes."""
+        rows = self.committed_rows(namespace)
+
+        cached = self.matrices.get(namespace)
+        if cached is not None and cached[0] == rows:
+            return cached[1]
+
+        if rows == 0:
+            matrix = np.zeros((0, self.dimension), dtype=np.float32)
+        else:
+            matrix = np.memmap(self.vectors_path(namespace), dtype=np.float32, mode='r', shape=(rows, self.dimension))
+        self.matrices[namespace] = (rows, matrix)
+        return matrix
+
+    def truncate_uncommitted(self, namespace, rows):
+        """Drops rows appended by an upsert that crashed or failed before committing its metadata."""
+        vectors_path = self.vectors_path(namespace)
+        if os.path.isfile(vectors_path) and os.path.getsize(vectors_path) > rows * 4 * self.dimension:
+            os.truncate(vectors_path, rows * 4 * self.dimension)
+
+    def tombstones_path(self, namespace):
+        return os.path.join(self.path, f"{namespace or 'default'}.deleted")
+
+    def get_tombstones(self, namespace):
+        """
+        Returns the namespace's deleted-row flags (1 = deleted) as a read-only memory map.
+        Rows past its end have never been deleted.
+        """
+        tombstones_path = self.tombstones_path(namespace)
+        size = os.path.getsize(tombstones_path) if os.path.isfile(tombstones_path) else 0
+
+        cached = self.tombstones.get(namespace)
+        if cached is not None and cached[0] == size:
+            return cached[1]
+
+        if size == 0:
+            flags = np.zeros(0, dtype=np.uint8)
+        else:
+            flags = np.memmap(tombstones_path, dtype=np.uint8, mode='r')
+        self.tombstones[namespace] = (size, flags)
+        return flags
+
+    def mark_deleted(self, rows, namespace):
+        """Sets the tombstone flags of rows, extending the file as needed."""
+        if not rows:
+            return
+        tombstones_path = self.tombstones_path(namespace)
+        size = os.path.getsize(tombstones_path) if os.path.isfile(tombstones_path) else 0
+        if max(rows) >= size:
+            with open(tombstones_path, "ab") as file:
+                file.write(bytes(max(rows) + 1 - size))
+
+        flags = np.memmap(tombstones_path, dtype=np.uint8, mode='r+')
+        flags[rows] = 1
+        flags.flush()
+        del flags
+        self.tombstones.pop(namespace, None)
+
+    def upsert(self, vectors, namespace=""):
+        """
+        Inserts or replaces vectors.
+        Args:
+            vectors (list): Dictionaries with id, values and optional metadata.
+            namespace (str): Namespace to write to.
+        Returns:
+            dict: Contains upserted_count.
+        """
+        if not vectors:
+            return {"upserted_count": 0}
+
+        values = np.asarray([vector["values"] for vector in vectors], dtype=np.float32)
+        if values.shape[1] != self.dimension:
+            raise ValueError(f"Vector dimension {values.shape[1]} does not match index dimension {self.dimension}")
+        values /= np.maximum(np.linalg.norm(values, axis=1, keepdims=True), 1e-12)
+
+        with self.lock:
+            # Appends start right after the committed rows
+            count = self.committed_rows(namespace)
+            self.truncate_uncommitted(namespace, count)
+
+            # Bring assignments an interrupted upsert left behind in step before adding rows
+            ann = self.get_ann(namespace)
+            if ann is not None and ann.is_trained():
+                ann.reconcile(self.get_matrix(namespace))
+
+            connection = self.connect()
+            try:
+                existing = {}
+                for start in range(0, len(vectors), 500):
+                    ids = [vector["id"] for vector in vectors[start:start + 500]]
+                    existing.update(connection.execute(
+                        f"SELECT id, row FROM vectors WHERE namespace = ? AND id IN ({', '.join('?' for _ in ids)})",
+                        [namespace, *ids]
+                    ).fetchall())
+
+                # Overwrite rows of known ids in place and append the rest
+                rows = []
+                appended = []
+                for position, vector in enumerate(vectors):
+                    row = existing.get(vector["id"])
+                    if row is None:
+                        row = count + len(appended)
+                        existing[vector["id"]] = row
+                        appended.append(position)
+                    rows.append(row)
+
+                if appended:
+                    with open(self.vectors_path(namespace), "ab") as file:
+                        file.write(values[appended].tobytes())
+
+                appended_positions = set(appended)
+                updated = [position for position in range(len(vectors)) if position not in appended_positions]
+                if updated:
+                    matrix = np.memmap(self.vectors_path(namespace), dtype=np.float32, mode='r+',
+                                       shape=(count + len(appended), self.dimension))
+                    matrix[[rows[position] for position in updated]] = values[updated]
+                    matrix.flush()
+                    del matrix
+
+                # Metadata is committed after the vectors, so it never points at missing rows
+                connection.executemany(
+                    "INSERT OR REPLACE INTO vectors (namespace, id, row, metadata) VALUES (?, ?, ?, ?)",
+                    [
+                        (namespace, vector["id"], row, json.dumps(vector.get("metadata", {})))
+                        for vector, row in zip(vectors, rows)
+                    ]
+                )
+                # Readers map only this many rows, so they never see a partly appended one
+                connection.execute(
+                    "INSERT OR REPLACE INTO namespaces (namespace, rows) VALUES (?, ?)",
+                    (namespace, count + len(appended))
+                )
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+            finally:
+                self.matrices.pop(namespace, None)
+
+            # Keep the IVF index in step, training it once the namespace is large enough
+            if ann is not None:
+                if ann.is_trained():
+                    ann.add(rows, values)
+                else:
+                    matrix = self.get_matrix(namespace)
+                    if len(matrix) >= VECTOR_STORE_CONFIG["ann_min_vectors"]:
+                        ann.train(matrix)
+
+        return {"upserted_count": len(vectors)}
+
+    def delete(self, ids, namespace=""):
+        """
+        Removes vectors by id. Their rows stay in the matrix, flagged in the
+        tombstone file so queries skip them.
+        Args:
+            ids (list): Vector ids to delete.
+            namespace (str): Namespace to delete from.
+        """
+        with self.lock:
+            connection = self.connect()
+            rows = []
+            with connection:
+                for start in range(0, len(ids), 500):
+                    batch = ids[start:start + 500]
+                    rows.extend(row for (row,) in connection.execute(
+                        f"SELECT row FROM vectors WHERE namespace = ? AND id IN ({', '.join('?' for _ in batch)})",
+                        [namespace, *batch]
+                    ))
+                connection.executemany(
+                    "DELETE FROM vectors WHERE namespace = ? AND id = ?",
+                    [(namespace, id) for id in ids]
+                )
+            self.mark_deleted(rows, namespace)
+        return {}
+
+    def query(self, vector, top_k=10, namespace="", include_values=False, include_metadata=False, filter=None,
+              nprobe=None, exact=False):
+        """
+        Finds the stored vectors most similar to a query vector.
+        Args:
+            vector (list): Query embedding.
+            top_k (int): Number of matches to return.
+            namespace (str): Namespace to search.
+            include_values (bool): Return stored vectors with the matches.
+            include_metadata (bool): Return metadata with the matches.
+            filter (dict): Pinecone-style metadata filter.
+            nprobe (int): IVF clusters to search, defaults to VECTOR_STORE_CONFIG["nprobe"].
+            exact (bool): Skip the IVF index and score every row.
+        Returns:
+            dict: Contains matches and namespace.
+        """
+        matrix = self.get_matrix(namespace)
+        query = np.asarray(vector, dtype=np.float32)
+        query /= max(np.linalg.norm(query), 1e-12)
+
+        connection = self.connect()
+        filter_rows = None
+        if filter:
+            condition, parameters = build_filter(filter)
+            filter_rows = np.fromiter(
+                (row for (row,) in connection.execute(
+                    f"SELECT row FROM vectors WHERE namespace = ? AND {condition}",
+                    [namespace, *parameters]
+                )),
+                dtype=np.int64
+            )
+            filter_rows = filter_rows[filter_rows < len(matrix)]
+
+        # Score only the rows in the nearest IVF clusters once the index is trained
+        tombstones = self.get_tombstones(namespace)
+        candidates = filter_rows
+        ann = None if exact else self.get_ann(namespace)
+        if ann is not None and ann.is_trained():
+            probed = ann.search(query, nprobe)
+            probed = probed[probed < len(matrix)]
+            if filter_rows is not None:
+                probed = probed[np.isin(probed, filter_rows)]
+            else:
+                flagged = probed < len(tombstones)
+                live = np.ones(len(probed), dtype=bool)
+                live[flagged] = tombstones[probed[flagged]] == 0
+                probed = probed[live]
+            # Too few live rows in the probed clusters: search exactly instead
+            if len(probed) >= top_k:
+                candidates = probed
+
+        if candidates is None:
+            # Deleted rows score -inf, so they are never picked ahead of live ones
+            scores = matrix @ query
+            deleted = np.flatnonzero(tombstones[:len(matrix)])
+            scores[deleted] = -np.inf
+            top_k = min(top_k, len(scores) - len(deleted))
+        else:
+            # Filter rows come from the metadata table, so they are all live
+            scores = matrix[candidates] @ query
+            top_k = min(top_k, len(scores))
+        if top_k <= 0:
+            return {"matches": [], "namespace": namespace}
+
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.argsort(-scores[best])]
+        rows = best if candidates is None else candidates[best]
+
+        records = dict(
+            (row, (id, metadata)) for (id, row, metadata) in connection.execute(
+                f"SELECT id, row, metadata FROM vectors WHERE namespace = ? AND row IN ({', '.join('?' for _ in rows)})",
+                [namespace, *(int(row) for row in rows)]
+            )
+        )
+
+        matches = []
+        for position, row in zip(best, rows):
+            if int(row) not in records:
+                continue  # Deleted while this query ran
+            id, metadata = records[int(row)]
+            match = {"id": id, "score": float(scores[position])}
+            if include_values:
+                match["values"] = matrix[row].tolist()
+            if include_metadata:
+                match["metadata"] = json.loads(metadata)
+            matches.append(match)
+
+        return {"matches": matches, "namespace": namespace}
@@ -52,7 +52,7 @@ Terminal output containing:
 
 
 from fetch_youtube_videos import fetch_videos
-from transcribe_videos import transcribe
+from transcribe_videos import transcribe_and_save
 
 def main():
     topic = input("Enter topic to analyze: ")
@@ -67,7 +67,7 @@ def main():
         print(f"\nVideo {idx}: {video['title']}")
         print(f"URL: {video['url']}")
         print("Transcribing...")
-        print(transcribe(video['url']))
+        print(transcribe_and_save(video['url']))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,255 @@
+"""
+# ONNX Sentence Embedding Module
+
+This module runs an exported, int8-quantized ONNX copy of the sentence-transformers model on
+CPU with ONNX Runtime. It produces vectors numerically close to the PyTorch model with less
+memory and lower latency, which helps most for single query embeddings on serving nodes.
+
+## Summary
+- Exports the model's transformer to ONNX and quantizes its weights to int8
+  (dynamic quantization), saving the tokenizer next to it
+- Reproduces the sentence-transformers pipeline: tokenize, transformer, mean pooling
+  over the attention mask, L2 normalisation
+- Offers the encode() / get_sentence_embedding_dimension() / tokenizer interface used
+  by embeddings.py, so it can replace SentenceTransformer (EMBEDDING_CONFIG["backend"])
+- Checks parity against the PyTorch model (cosine similarity >= 0.99) and measures
+  throughput and single-query latency of both (run this module)
+
+## Dependencies
+
+### System Requirements
+- Python 3.8+
+
+### Package Dependencies
+1. **onnxruntime**
+   - Install: `pip install onnxruntime`
+   - Purpose: Runs the exported model
+
+2. **transformers**
+   - Installed with sentence-transformers
+   - Purpose: Tokenizer
+
+3. **sentence-transformers**, **torch** and **onnx** (export, parity check and benchmark only)
+   - Install: `pip install sentence-transformers onnx`
+   - Purpose: Reference model and ONNX export
+
+### Project Dependencies
+1. config.py
+   - Provides EMBEDDING_CONFIG with:
+     - model_name
+     - batch_size
+     - onnx_dir
+     - onnx_quantized
+     - onnx_threads
+     - max_seq_length
+
+## Functions
+1. export_model(model_name, onnx_dir)
+   - Writes model.onnx, model_int8.onnx and the tokenizer files to onnx_dir
+
+2. check_parity(encoder, reference, sentences)
+   - Returns the minimum and mean cosine similarity between two encoders
+
+3. measure_throughput(encoder, sentences, batch_size)
+   - Returns sentences per second and mean single-query latency
+
+## Classes
+OnnxEncoder(onnx_dir, quantized, threads)
+- encode(sentences, batch_size, convert_to_numpy): Normalised embeddings
+- get_sentence_embedding_dimension(): Vector size
+- tokenizer: Hugging Face tokenizer of the model
+
+## Usage
+```
+python onnx_embeddings.py
+```
+Exports the model if needed, then prints the parity check and the benchmark. Exits with
+an error if the parity check fails.
+"""
+
+import os
+import sys
+import time
+import numpy as np
+from config import EMBEDDING_CONFIG
+
+PARITY_THRESHOLD = 0.99
+
+def export_model(model_name=None, onnx_dir=None):
+    """
+    Exports a sentence-transformers model to ONNX and quantizes it.
+    Args:
+        model_name (str): Model to export, defaults to EMBEDDING_CONFIG["model_name"].
+        onnx_dir (str): Output directory, defaults to EMBEDDING_CONFIG["onnx_dir"].
+    Returns:
+        str: Output directory.
+    """
+    import torch
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+    from sentence_transformers import SentenceTransformer
+
+    model_name = model_name or EMBEDDING_CONFIG["model_name"]
+    onnx_dir = onnx_dir or EMBEDDING_CONFIG["onnx_dir"]
+    os.makedirs(onnx_dir, exist_ok=True)
+
+    reference = SentenceTransformer(model_name, device="cpu")
+    transformer = reference[0].auto_model.eval()
+    tokenizer = reference.tokenizer
+    tokenizer.save_pretrained(onnx_dir)
+
+    sample = tokenizer(["An example sentence to trace the model."], return_tensors="pt")
+    names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    axes = {name: {0: "batch", 1: "tokens"} for name in names}
+    axes["last_hidden_state"] = {0: "batch", 1: "tokens"}
+
+    fp32_path = os.path.join(onnx_dir, "model.onnx")
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            tuple(sample[name] for name in names),
+            fp32_path,
+            input_names=names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=axes,
+            opset_version=14,
+        )
+
+    quantize_dynamic(fp32_path, os.path.join(onnx_dir, "model_int8.onnx"), weight_type=QuantType.QInt8)
+    return onnx_dir
+
+class OnnxEncoder:
+    """Sentence encoder running an exported model with ONNX Runtime."""
+
+    def __init__(self, onnx_dir=None, quantized=None, threads=None):
+        import onnxruntime
+        from transformers import AutoTokenizer
+
+        onnx_dir = onnx_dir or EMBEDDING_CONFIG["onnx_dir"]
+        quantized = EMBEDDING_CONFIG["onnx_quantized"] if quantized is None else quantized
+        threads = EMBEDDING_CONFIG["onnx_threads"] if threads is None else threads
+
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        path = os.path.join(onnx_dir, "model_int8.onnx" if quantized else "model.onnx")
+        self.session = onnxruntime.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+        self.tokenizer = AutoTokenizer.from_pretrained(onnx_dir)
+        self.dimension = self.session.get_outputs()[0].shape[-1]
+
+    def get_sentence_embedding_dimension(self):
+        return self.dimension
+
+    def encode_batch(self, sentences):
+        tokens = self.tokenizer(
+            sentences,
+            padding=True,
+            truncation=True,
+            max_length=EMBEDDING_CONFIG["max_seq_length"],
+            return_tensors="np"
+        )
+        inputs = {name: tokens[name].astype(np.int64) for name in self.input_names}
+        hidden = self.session.run(None, inputs)[0]
+
+        # Mean pooling over real tokens, then unit length (as the sentence-transformers model does)
+        mask = tokens["attention_mask"][..., None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        return pooled / np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+
+    def encode(self, sentences, batch_size=32, convert_to_numpy=True, **kwargs):
+        """
+        Encodes one text or a list of texts.
+        Args:
+            sentences (str or list): Texts to encode.
+            batch_size (int): Texts per forward pass.
+            convert_to_numpy (bool): Accepted for compatibility; results are always numpy.
+        Returns:
+            numpy.ndarray: One float32 vector for a single text, else one row per text.
+        """
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+
+        embeddings = np.empty((len(sentences), self.dimension), dtype=np.float32)
+        for start in range(0, len(sentences), batch_size):
+            embeddings[start:start + batch_size] = self.encode_batch(sentences[start:start + batch_size])
+
+        return embeddings[0] if single else embeddings
+
+def check_parity(encoder, reference, sentences):
+    """
+    Compares two encoders on the same texts.
+    Args:
+        encoder: Encoder under test (e.g. OnnxEncoder).
+        reference: Reference encoder (e.g. SentenceTransformer).
+        sentences (list): Texts to encode.
+    Returns:
+        dict: min_cosine and mean_cosine.
+    """
+    actual = np.asarray(encoder.encode(sentences), dtype=np.float32)
+    expected = np.asarray(reference.encode(sentences), dtype=np.float32)
+
+    cosine = (actual * expected).sum(axis=1) / (
+        np.linalg.norm(actual, axis=1) * np.linalg.norm(expected, axis=1)
+    )
+    return {"min_cosine": float(cosine.min()), "mean_cosine": float(cosine.mean())}
+
+def measure_throughput(encoder, sentences, batch_size=32):
+    """
+    Measures batch throughput and single-query latency.
+    Args:
+        encoder: Encoder to measure.
+        sentences (list): Texts to encode.
+        batch_size (int): Texts per forward pass for the throughput run.
+    Returns:
+        dict: sentences_per_second and query_ms.
+    """
+    encoder.encode(sentences[:batch_size], batch_size=batch_size)  # Warm up
+
+    start = time.perf_counter()
+    encoder.encode(sentences, batch_size=batch_size)
+    throughput = len(sentences) / (time.perf_counter() - start)
+
+    queries = sentences[:50]
+    start = time.perf_counter()
+    for sentence in queries:
+        encoder.encode(sentence)
+    query_ms = 1000 * (time.perf_counter() - start) / len(queries)
+
+    return {"sentences_per_second": throughput, "query_ms": query_ms}
+
+if __name__ == "__main__":
+    from sentence_transformers import SentenceTransformer
+
+    if not os.path.isfile(os.path.join(EMBEDDING_CONFIG["onnx_dir"], "model_int8.onnx")):
+        print(f"Exporting {EMBEDDING_CONFIG['model_name']} to {export_model()}")
+
+    # Passage-like texts of varied length
+    rng = np.random.default_rng(0)
+    words = ("machine learning model data training neural network gradient descent loss function "
+             "python tutorial lesson example vector database embedding search query video topic "
+             "summary transcript introduction basics course").split()
+    sentences = [" ".join(rng.choice(words, rng.integers(5, 150))) for _ in range(512)]
+
+    reference = SentenceTransformer(EMBEDDING_CONFIG["model_name"], device="cpu")
+    encoders = [
+        ("torch", reference),
+        ("onnx fp32", OnnxEncoder(quantized=False)),
+        ("onnx int8", OnnxEncoder(quantized=True)),
+    ]
+
+    failed = False
+    for name, encoder in encoders[1:]:
+        parity = check_parity(encoder, reference, sentences)
+        status = "OK" if parity["min_cosine"] >= PARITY_THRESHOLD else "FAILED"
+        failed = failed or status == "FAILED"
+        print(f"{name:10s} parity {status}: min cosine={parity['min_cosine']:.4f} mean={parity['mean_cosine']:.4f}")
+
+    for name, encoder in encoders:
+        result = measure_throughput(encoder, sentences, EMBEDDING_CONFIG["batch_size"])
+        print(f"{name:10s} {result['sentences_per_second']:.1f} sentences/s, {result['query_ms']:.2f} ms per query")
+
+    if failed:
+        sys.exit(f"ONNX embeddings differ from the reference (cosine < {PARITY_THRESHOLD})")
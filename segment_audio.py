@@ -0,0 +1,179 @@
+"""
+# Audio Segmentation Module
+
+This module splits decoded audio into speech segments with a simple energy-based voice
+activity detector, so long videos can be transcribed as independent pieces in parallel
+and silent stretches are never sent to Whisper.
+
+## Summary
+- Measures frame energy (dBFS) over short frames of 16 kHz mono audio
+- Marks frames as speech when they are within a margin of the loudest frame
+- Fills short pauses, drops very short bursts and pads speech boundaries
+- Packs speech regions into segments no longer than one Whisper window, cutting
+  longer speech at the quietest frame shortly before the limit (a pause between
+  words) rather than at an arbitrary sample
+
+## Dependencies
+
+### System Requirements
+- Python 3.8+
+
+### Package Dependencies
+1. **numpy**
+   - Install: `pip install numpy`
+   - Purpose: Frame energy computation
+
+### Project Dependencies
+1. config.py
+   - Provides VAD_CONFIG with:
+     - frame_ms
+     - silence_floor_db
+     - dynamic_range_db
+     - min_speech_ms
+     - min_silence_ms
+     - padding_ms
+     - max_segment_seconds
+     - cut_search_ms
+
+2. download_audio.py
+   - Provides SAMPLE_RATE
+
+## Functions
+1. frame_energy_db(audio)
+   - Returns the energy of each frame in dBFS
+
+2. detect_speech(audio, energy=None)
+   - Returns (start, end) sample ranges containing speech
+
+3. plan_segments(audio)
+   - Returns (start, end) sample ranges to transcribe, each at most max_segment_seconds
+
+## Returns
+Lists of (start_sample, end_sample) tuples in increasing order
+"""
+
+import numpy as np
+from config import VAD_CONFIG
+from download_audio import SAMPLE_RATE
+
+def ms_to_frames(milliseconds):
+    """Converts a duration in milliseconds to a whole number of frames."""
+    return max(1, int(round(milliseconds / VAD_CONFIG["frame_ms"])))
+
+def frame_energy_db(audio):
+    """
+    Computes the RMS energy of consecutive frames.
+    Args:
+        audio (numpy.ndarray): float32 samples at 16 kHz.
+    Returns:
+        numpy.ndarray: Energy of each frame in dBFS.
+    """
+    frame_length = SAMPLE_RATE * VAD_CONFIG["frame_ms"] // 1000
+    frame_count = len(audio) // frame_length
+    if frame_count == 0:
+        return np.zeros(0, dtype=np.float32)
+
+    frames = np.asarray(audio[:frame_count * frame_length], dtype=np.float32).reshape(frame_count, frame_length)
+    rms = np.sqrt(np.mean(np.square(frames), axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+def detect_speech(audio, energy=None):
+    """
+    Finds the parts of the audio that contain speech.
+    Args:
+        audio (numpy.ndarray): float32 samples at 16 kHz.
+        energy (numpy.ndarray): Result of frame_energy_db(audio), if already computed.
+    Returns:
+        list: (start_sample, end_sample) tuples.
+    """
+    if energy is None:
+        energy = frame_energy_db(audio)
+    if len(energy) == 0:
+        return []
+
+    threshold = max(VAD_CONFIG["silence_floor_db"], energy.max() - VAD_CONFIG["dynamic_range_db"])
+    is_speech = energy > threshold
+
+    # Collect runs of speech frames as [start, end) frame ranges
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], is_speech.astype(np.int8), [0]))))
+    regions = [[int(start), int(end)] for start, end in zip(edges[::2], edges[1::2])]
+
+    # Bridge pauses that are too short to be real silence
+    min_silence = ms_to_frames(VAD_CONFIG["min_silence_ms"])
+    merged = []
+    for region in regions:
+        if merged and region[0] - merged[-1][1] < min_silence:
+            merged[-1][1] = region[1]
+        else:
+            merged.append(region)
+
+    # Drop clicks and bursts too short to be speech, then pad the boundaries
+    min_speech = ms_to_frames(VAD_CONFIG["min_speech_ms"])
+    padding = ms_to_frames(VAD_CONFIG["padding_ms"])
+    frame_length = SAMPLE_RATE * VAD_CONFIG["frame_ms"] // 1000
+
+    speech = []
+    for start, end in merged:
+        if end - start < min_speech:
+            continue
+        start = max(0, start - padding) * frame_length
+        end = min(len(audio), (end + padding) * frame_length)
+        if speech and start <= speech[-1][1]:
+            speech[-1] = (speech[-1][0], end)
+        else:
+            speech.append((start, end))
+    return speech
+
+def find_cut(energy, start, limit):
+    """
+    Picks where to end a segment that cannot extend past limit: the middle of the
+    quietest frame in the last cut_search_ms before it.
+    Args:
+        energy (numpy.ndarray): Frame energies from frame_energy_db.
+        start (int): First sample of the segment.
+        limit (int): Latest sample the segment may end at.
+    Returns:
+        int: Sample to cut at, after start and no later than limit.
+    """
+    frame_length = SAMPLE_RATE * VAD_CONFIG["frame_ms"] // 1000
+    first = max(start // frame_length + 1, (limit - SAMPLE_RATE * VAD_CONFIG["cut_search_ms"] // 1000) // frame_length)
+    last = min(limit // frame_length, len(energy))
+    if first >= last:
+        return limit
+
+    quietest = first + int(np.argmin(energy[first:last]))
+    return min(limit, quietest * frame_length + frame_length // 2)
+
+def plan_segments(audio):
+    """
+    Packs detected speech into segments that fit in one Whisper window.
+    Speech regions longer than the limit are cut at the quietest frame before it.
+    Args:
+        audio (numpy.ndarray): float32 samples at 16 kHz.
+    Returns:
+        list: (start_sample, end_sample) tuples. The whole audio is returned as
+        segments when no speech is detected, so nothing is silently dropped.
+    """
+    max_length = int(VAD_CONFIG["max_segment_seconds"] * SAMPLE_RATE)
+
+    energy = frame_energy_db(audio)
+    speech = detect_speech(audio, energy)
+    if not speech:
+        speech = [(0, len(audio))] if len(audio) else []
+
+    segments = []
+    for start, end in speech:
+        # Whisper always encodes a full 30 s window, so packing neighbouring speech
+        # into one segment saves windows; gaps longer than a window are dropped
+        if segments and end - segments[-1][0] <= max_length:
+            segments[-1] = (segments[-1][0], end)
+            continue
+
+        # Continuous speech: cut in the quietest spot near each limit, so a word is
+        # not split between two segments
+        while end - start > max_length:
+            cut = find_cut(energy, start, start + max_length)
+            segments.append((start, cut))
+            start = cut
+        segments.append((start, end))
+    return segments
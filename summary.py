@@ -7,10 +7,14 @@ using Google's Gemini AI model.
 ## Summary
 - Takes multiple video transcriptions as input
 - Concatenates transcriptions for unified analysis
+- Summarizes long transcription sets map-reduce style: parts are summarized
+  concurrently under asyncio (the shared client's ainvoke), then partial summaries
+  are merged into the final result
 - Uses Gemini AI to generate:
   - Relevant topic title
   - Concise content summary
   - Key points from the content
+- Parses the response sections in a single pass, also while it is streamed
 - Handles response parsing and error cases
 
 ## Dependencies
@@ -32,6 +36,7 @@ using Google's Gemini AI model.
 1. **keys1.env file**
    - Must contain: GEMINI_API_KEY
    - Format: GEMINI_API_KEY=your_api_key_here
+   - Loaded once by llm_client.py, which also provides the shared Gemini client
 
 2. **Input Requirements**
    - Transcription texts from processed videos
@@ -39,10 +44,17 @@ using Google's Gemini AI model.
 
 ## Functions
 generate_combined_summary_and_key_points(transcriptions)
-- Args: List of transcription texts
+- Args: List of transcription texts (a single text is also accepted)
+- Responses are cached by (model, prompt version, transcriptions), see llm_cache.py
+- Inputs longer than SUMMARY_CONFIG["max_prompt_chars"] are split into
+  chunk_chars parts and summarized with up to max_workers concurrent requests
 - Returns: Tuple of (topic_title, summary, key_points)
 - Error Returns: Error messages with empty lists if processing fails
 
+stream_combined_summary_and_key_points(transcriptions)
+- Same as above, streaming: yields (name, value) for topic_title, summary and
+  key_points as soon as each section of the response is complete
+
 ## Returns
 Tuple containing:
 1. topic_title (str): Generated title for the content
@@ -56,20 +68,136 @@ Tuple containing:
   - Response parsing fails
 """
 
-import os
-import glob
-from dotenv import load_dotenv, find_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
+import re
+import asyncio
+from config import SUMMARY_CONFIG
+from llm_cache import make_key, get_response, put_response
+from llm_client import GEMINI_MODEL, get_llm, predict, apredict, stream, parse_sections
 
-def generate_combined_summary_and_key_points(transcriptions):
-    if not all(transcriptions):
-        return "Error: No transcription text provided.", [], ""
+# Bump when a prompt below changes so cached responses are not reused
+SUMMARY_PROMPT_VERSION = "1"
+PART_PROMPT_VERSION = "1"
+REDUCE_PROMPT_VERSION = "1"
+
+# Response sections, matched at the start of a line (tolerating markdown emphasis)
+SUMMARY_SECTIONS = {
+    "topic_title": re.compile(r"[\s#*]*Topic Title:\**"),
+    "summary": re.compile(r"[\s#*]*Summary:\**"),
+    "key_points": re.compile(r"[\s#*]*Key Points:\**"),
+}
+SECTION_ERRORS = {
+    "topic_title": "Error: Unable to generate topic title.",
+    "summary": "Error: Unable to extract summary.",
+    "key_points": [],
+}
+
+def predict_cached(prompt, template_version, inputs):
+    """Returns the model response for a prompt, reusing cached responses for identical inputs."""
+    cache_key = make_key(GEMINI_MODEL, template_version, inputs)
+    response = get_response(cache_key)
+
+    if response is None:
+        # Generate the response from the model
+        response = predict(get_llm(GEMINI_MODEL), prompt)
+
+        if response:
+            put_response(cache_key, response, model=GEMINI_MODEL, template_version=template_version)
+
+    return response
+
+async def apredict_cached(prompt, template_version, inputs):
+    """Awaitable version of predict_cached."""
+    cache_key = make_key(GEMINI_MODEL, template_version, inputs)
+    response = get_response(cache_key)
+
+    if response is None:
+        response = await apredict(get_llm(GEMINI_MODEL), prompt)
+
+        if response:
+            put_response(cache_key, response, model=GEMINI_MODEL, template_version=template_version)
+
+    return response
 
+def stream_cached(prompt, template_version, inputs):
+    """Yields the model response as it arrives, caching it once complete."""
+    cache_key = make_key(GEMINI_MODEL, template_version, inputs)
+    response = get_response(cache_key)
+
+    if response is not None:
+        yield response
+        return
+
+    parts = []
+    for chunk in stream(get_llm(GEMINI_MODEL), prompt):
+        parts.append(chunk)
+        yield chunk
+
+    response = "".join(parts)
+    if response:
+        put_response(cache_key, response, model=GEMINI_MODEL, template_version=template_version)
+
+def split_text(text, chunk_chars):
+    """Splits text into pieces of at most chunk_chars, preferring sentence ends."""
+    pieces = []
+    while len(text) > chunk_chars:
+        cut = text.rfind(". ", 0, chunk_chars)
+        if cut <= 0:
+            cut = text.rfind(" ", 0, chunk_chars)
+        cut = cut + 1 if cut > 0 else chunk_chars
+        pieces.append(text[:cut].strip())
+        text = text[cut:]
+    if text.strip():
+        pieces.append(text.strip())
+    return pieces
+
+def group_texts(texts, chunk_chars):
+    """Joins consecutive texts into groups of at most chunk_chars (single long texts stay alone)."""
+    groups = []
+    for text in texts:
+        if groups and len(groups[-1]) + len(text) + 1 <= chunk_chars:
+            groups[-1] += "\n" + text
+        else:
+            groups.append(text)
+    return groups
+
+def part_prompt(text):
+    """Map step prompt: condenses one transcript part (or group of partial summaries)."""
+    return f"""
+    The following is part of one or more video transcriptions, or summaries of such parts:
+    ---
+    {text}
+    ---
+    Write a detailed summary of this text that keeps every key insight, fact, example and definition.
+    Ignore sponsors. Do not add a title or any introduction.
+    """
+
+async def asummarize_parts(texts):
+    """
+    Map step: condenses each transcript part (or group of partial summaries), with up
+    to max_workers requests in flight on the shared client, keeping their order.
+    """
+    semaphore = asyncio.Semaphore(SUMMARY_CONFIG["max_workers"])
+
+    async def summarize(text):
+        async with semaphore:
+            return await apredict_cached(part_prompt(text), PART_PROMPT_VERSION, text) or ""
+
+    return await asyncio.gather(*(summarize(text) for text in texts))
+
+def summarize_parts(texts):
+    """Runs asummarize_parts from synchronous code, e.g. a request worker thread without an event loop."""
+    return asyncio.run(asummarize_parts(texts))
+
+def needs_reduce(texts):
+    return sum(len(text) for text in texts) > SUMMARY_CONFIG["max_prompt_chars"]
+
+def summary_prompt(texts, source):
+    """Final prompt asking for topic title, summary and key points."""
     # Concatenate the transcriptions into one single string
-    concatenated_transcriptions = "\n".join(transcriptions)
+    concatenated_transcriptions = "\n".join(texts)
 
-    prompt = f"""
-    The following are transcriptions of videos:
+    return f"""
+    The following are {source}:
     ---
     {concatenated_transcriptions}
     ---
@@ -87,36 +215,76 @@ def generate_combined_summary_and_key_points(transcriptions):
     - [Key point 2]
     - [Key point 3]
     """
-    # Load environment variables
-    load_dotenv(find_dotenv('keys1.env'))
-
-    # Get API key
-    GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-    GEMINI_MODEL = "gemini-1.5-flash"
 
-    # Initialize Gemini API
-    llm = ChatGoogleGenerativeAI(model=GEMINI_MODEL, api_key=GEMINI_API_KEY)
+def parse_sections_values(chunks):
+    """Yields (name, value) for each response section; key points are returned as a list."""
+    for name, text in parse_sections(chunks, SUMMARY_SECTIONS):
+        if name == "key_points":
+            yield name, [point.strip(" -") for point in text.split("\n")]
+        else:
+            yield name, text
 
-    # Generate the response from the model
-    response = llm.predict(prompt)
-    
+def parse_summary_response(response):
+    """Splits a response into (topic_title, summary, key_points)."""
     if not response:
         return "Error: No response generated.", [], ""
 
     # Extract topic title, summary, and key points from response
-    topic_title_start = response.find("Topic Title:")
-    summary_start = response.find("Summary:")
-    key_points_start = response.find("Key Points:")
-
-    if topic_title_start != -1 and summary_start != -1 and key_points_start != -1:
-        topic_title = response[topic_title_start + len("Topic Title:"): summary_start].strip()
-        summary = response[summary_start + len("Summary:"): key_points_start].strip()
-        key_points_str = response[key_points_start + len("Key Points:"):].strip()
-        key_points = [point.strip(" -") for point in key_points_str.split("\n")]
-    else:
-        topic_title = "Error: Unable to generate topic title."
-        summary = "Error: Unable to extract summary."
-        key_points = []
-
-    return topic_title, summary, key_points
+    sections = dict(parse_sections_values([response]))
+
+    if all(name in sections for name in SUMMARY_SECTIONS):
+        return sections["topic_title"], sections["summary"], sections["key_points"]
+    return SECTION_ERRORS["topic_title"], SECTION_ERRORS["summary"], SECTION_ERRORS["key_points"]
+
+def prepare_summary_prompt(transcriptions):
+    """Returns (prompt, template_version, inputs) of the final request, condensing long inputs first."""
+    if not needs_reduce(transcriptions):
+        return summary_prompt(transcriptions, "transcriptions of videos"), SUMMARY_PROMPT_VERSION, transcriptions
+
+    # Long inputs are summarized hierarchically: summarize parts concurrently,
+    # then keep merging partial summaries until they fit in one prompt
+    chunk_chars = SUMMARY_CONFIG["chunk_chars"]
+    texts = summarize_parts([part for text in transcriptions for part in split_text(text, chunk_chars)])
+
+    while needs_reduce(texts):
+        groups = group_texts(texts, chunk_chars)
+        if len(groups) >= len(texts):
+            break
+        texts = summarize_parts(groups)
+
+    source = "summaries of consecutive parts of video transcriptions"
+    return summary_prompt(texts, source), REDUCE_PROMPT_VERSION, texts
+
+def generate_combined_summary_and_key_points(transcriptions):
+    if isinstance(transcriptions, str):
+        transcriptions = [transcriptions]
+
+    if not all(transcriptions):
+        return "Error: No transcription text provided.", [], ""
+
+    # Reuse the response for identical inputs
+    response = predict_cached(*prepare_summary_prompt(transcriptions))
+    return parse_summary_response(response)
+
+def stream_combined_summary_and_key_points(transcriptions):
+    """
+    Streams the summary, yielding each section as soon as it is complete.
+    Yields:
+        tuple: (name, value) with name topic_title, summary or key_points.
+    """
+    if isinstance(transcriptions, str):
+        transcriptions = [transcriptions]
+
+    if not all(transcriptions):
+        yield "topic_title", "Error: No transcription text provided."
+        return
+
+    seen = set()
+    for name, value in parse_sections_values(stream_cached(*prepare_summary_prompt(transcriptions))):
+        seen.add(name)
+        yield name, value
 
+    # Sections already shown cannot be withdrawn, so only the missing ones are reported
+    for name, error in SECTION_ERRORS.items():
+        if name not in seen:
+            yield name, error
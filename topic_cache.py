@@ -0,0 +1,256 @@
+"""
+# Topic Result Cache Module
+
+This module keeps the finished analysis of each topic, so repeated or trending topics are
+answered instantly instead of going through fetch, transcription, summary and idea
+generation again, and makes concurrent requests for the same topic share one computation.
+
+## Summary
+- Keys results by the normalised topic and a fingerprint of FILTER_CONFIG, so changing
+  the video filters invalidates them
+- Serves fresh results directly and stale results while a background refresh runs
+  (stale-while-revalidate); results past their maximum age are recomputed
+- Runs at most one computation per topic at a time (single-flight): later requests
+  follow the running one and receive the same streamed updates
+- Bounds how many computations and background refreshes run at once
+- Persists results in a SQLite file and evicts the least recently used beyond a limit
+
+## Dependencies
+
+### System Requirements
+- Python 3.8+
+
+### Package Dependencies
+No additional package installations required beyond project dependencies
+
+### Project Dependencies
+1. config.py
+   - Provides FILTER_CONFIG
+   - Provides TOPIC_CACHE_CONFIG with:
+     - path
+     - fresh_seconds
+     - max_age_seconds
+     - max_entries
+     - max_flights
+     - refresh_workers
+
+## Functions
+1. make_key(topic)
+   - Returns the cache key for a topic under the current filters
+
+2. get_result(key)
+   - Returns (results, age_seconds), or None if missing or too old
+
+3. put_result(key, results)
+   - Stores the final results of a topic and runs eviction
+
+4. is_fresh(age_seconds)
+   - Whether a cached result can be served without refreshing it
+
+5. join_flight(key, compute)
+   - Returns the running computation for a key, starting compute() on the bounded
+     flight pool if none is running
+
+6. refresh_in_background(key, compute)
+   - Refreshes a stale key on the refresh pool, or does nothing if that pool is busy
+
+## Classes
+Flight()
+- publish(value): Records the latest update of the computation
+- finish(): Marks the computation as done
+- follow(): Yields the latest update each time it changes, until the computation is done
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config import FILTER_CONFIG, TOPIC_CACHE_CONFIG
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS topics (
+    key TEXT PRIMARY KEY,
+    results TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+)
+"""
+
+flights = {}
+flights_lock = threading.Lock()
+
+# Computations run on bounded pools: requests that miss the cache on flight_pool, and
+# stale-while-revalidate refreshes on a separate, smaller refresh_pool
+flight_pool = ThreadPoolExecutor(max_workers=TOPIC_CACHE_CONFIG["max_flights"])
+refresh_pool = ThreadPoolExecutor(max_workers=TOPIC_CACHE_CONFIG["refresh_workers"])
+refreshes = 0
+
+def get_connection():
+    """
+    Opens a connection to the cache database, creating it if needed.
+    Returns:
+        sqlite3.Connection: Connection in autocommit mode.
+    """
+    path = TOPIC_CACHE_CONFIG["path"]
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute(SCHEMA)
+    return connection
+
+def make_key(topic):
+    """
+    Builds a cache key.
+    Args:
+        topic (str): Topic as entered by the user.
+    Returns:
+        str: SHA-256 hex digest of the normalised topic and the filter settings.
+    """
+    normalized = " ".join(topic.lower().split())
+    # Keyword sets are stored in a fixed order so the fingerprint is stable
+    filters = json.dumps(FILTER_CONFIG, sort_keys=True, default=sorted)
+    return hashlib.sha256(json.dumps([normalized, filters]).encode("utf-8")).hexdigest()
+
+def get_result(key):
+    """
+    Looks up the cached results of a topic.
+    Args:
+        key (str): Key from make_key.
+    Returns:
+        tuple: (results, age in seconds), or None if missing or older than max_age_seconds.
+    """
+    now = time.time()
+
+    connection = get_connection()
+    try:
+        row = connection.execute(
+            "SELECT results, created_at FROM topics WHERE key = ? AND created_at >= ?",
+            (key, now - TOPIC_CACHE_CONFIG["max_age_seconds"])
+        ).fetchone()
+
+        if row is not None:
+            connection.execute("UPDATE topics SET last_access = ? WHERE key = ?", (now, key))
+    finally:
+        connection.close()
+
+    if row is None:
+        return None
+    return json.loads(row[0]), now - row[1]
+
+def put_result(key, results):
+    """
+    Stores the results of a topic, then drops expired and least recently used entries.
+    Args:
+        key (str): Key from make_key.
+        results: JSON-serialisable results.
+    """
+    now = time.time()
+
+    connection = get_connection()
+    try:
+        connection.execute(
+            "INSERT OR REPLACE INTO topics (key, results, created_at, last_access) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(results, ensure_ascii=False), now, now)
+        )
+        connection.execute(
+            "DELETE FROM topics WHERE created_at < ?",
+            (now - TOPIC_CACHE_CONFIG["max_age_seconds"],)
+        )
+        connection.execute(
+            "DELETE FROM topics WHERE key IN ("
+            "SELECT key FROM topics ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (TOPIC_CACHE_CONFIG["max_entries"],)
+        )
+    finally:
+        connection.close()
+
+def is_fresh(age_seconds):
+    return age_seconds <= TOPIC_CACHE_CONFIG["fresh_seconds"]
+
+class Flight:
+    """One running computation whose updates any number of requests can follow."""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.latest = None
+        self.version = 0
+        self.done = False
+
+    def publish(self, value):
+        with self.condition:
+            self.latest = value
+            self.version += 1
+            self.condition.notify_all()
+
+    def finish(self):
+        with self.condition:
+            self.done = True
+            self.condition.notify_all()
+
+    def follow(self):
+        """Yields the latest update whenever it changes; intermediate updates may be skipped."""
+        seen = 0
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.version > seen or self.done)
+                if self.version == seen:
+                    return
+                value = self.latest
+                seen = self.version
+            yield value
+
+def run_flight(key, flight, compute, refresh=False):
+    global refreshes
+    try:
+        for value in compute():
+            flight.publish(value)
+    finally:
+        with flights_lock:
+            flights.pop(key, None)
+            if refresh:
+                refreshes -= 1
+        flight.finish()
+
+def join_flight(key, compute):
+    """
+    Returns the running computation for a key, or starts one.
+    Args:
+        key (str): Key from make_key.
+        compute (callable): Returns a generator of updates; runs on the bounded flight
+            pool so it completes even if every follower disconnects.
+    Returns:
+        Flight: Computation to follow.
+    """
+    with flights_lock:
+        flight = flights.get(key)
+        if flight is None:
+            flight = Flight()
+            flights[key] = flight
+            flight_pool.submit(run_flight, key, flight, compute)
+        return flight
+
+def refresh_in_background(key, compute):
+    """
+    Recomputes a stale key on the refresh pool. Skipped when the key is already being
+    computed or every refresh worker is busy, so refreshes never queue up.
+    Args:
+        key (str): Key from make_key.
+        compute (callable): Returns a generator of updates.
+    Returns:
+        bool: Whether a refresh was started.
+    """
+    global refreshes
+    with flights_lock:
+        if key in flights or refreshes >= TOPIC_CACHE_CONFIG["refresh_workers"]:
+            return False
+        flight = Flight()
+        flights[key] = flight
+        refreshes += 1
+        refresh_pool.submit(run_flight, key, flight, compute, True)
+        return True
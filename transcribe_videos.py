@@ -4,8 +4,13 @@
 This module handles the audio extraction and transcription of YouTube videos using Whisper AI.
 
 ## Summary
-- Downloads audio from YouTube videos using yt-dlp
-- Transcribes audio using OpenAI's Whisper model
+- Uses the video's YouTube captions when usable (fetch_captions.py)
+- Otherwise downloads audio from YouTube videos using yt-dlp into a local spool
+- Decodes audio once to 16 kHz mono PCM read by Whisper from a memory map
+- Transcribes audio using OpenAI's Whisper model, or the int8-quantized
+  CTranslate2 port (faster-whisper) on CPU, selected in WHISPER_CONFIG
+- Optionally batches 30-second windows from all queued videos into one encoder
+  pass and batched greedy decoding (WHISPER_CONFIG batch_size / batch_wait_ms)
 - Saves transcriptions as text files
 - Handles various YouTube URL formats
 - Provides error handling for failed downloads/transcriptions
@@ -33,26 +38,85 @@ This module handles the audio extraction and transcription of YouTube videos usi
    - Install: `pip install torch`
    - Purpose: Required by Whisper for model operations
 
+4. **faster-whisper** (optional)
+   - Install: `pip install faster-whisper`
+   - Purpose: Quantized CPU backend, used when WHISPER_CONFIG["backend"] is "faster-whisper"
+
 ### Project Dependencies
 1. **output/** directory
    - Must exist or have permissions to create
    - Stores transcription text files
 
+2. transcript_cache.py
+   - Persistent transcript store keyed by video ID
+
+3. download_audio.py
+   - Resumable audio download and PCM decoding
+
+4. fetch_captions.py
+   - Caption-based transcripts, tried before any audio is downloaded
+
 ## Functions
-1. extract_video_id(url)
+1. get_model(model_name=None, device=None, compute_type=None, backend=None) / preload_model()
+   - Loads Whisper lazily on first use, one shared instance per configuration
+   - Backend, model size, device, compute type, threads and beam size come from
+     WHISPER_CONFIG in config.py
+   - run_model(audio) transcribes with the configured backend; every backend
+     returns the same text, language and segment format
+   - run_model_batch(audios) transcribes several windows in one batched pass
+   - preload_model() loads and warms up the model; it is the initializer of the
+     transcription worker processes
+   - start_transcribe_pool() starts every worker at startup, so the first request
+     does not pay for loading the model
+
+2. extract_video_id(url)
    - Extracts YouTube video ID from various URL formats
    - Handles both youtube.com and youtu.be URLs
    
-2. transcribe_and_save(url, output_dir="output")
+3. read_previous_transcript(video_id, output_dir, processed_dir)
+   - Reads a transcript saved by an earlier run in output/ or processed/
+
+4. prepare_audio(url, output_dir="output")
+   - I/O-bound stage: cache lookup, captions, audio download and decoding
+   - Only cached transcripts of the configured Whisper model (get_model_id) or of
+     enabled caption sources are reused
+   - Audio is only downloaded when no usable captions exist
+
+5. transcribe_audio(pcm_path)
+   - CPU-bound stage: splits audio into speech segments (segment_audio.py)
+   - Decodes segments in parallel worker processes (transcribe_segment), or
+     hands them to the shared SegmentBatcher, which groups segments of every
+     video being transcribed into batches (transcribe_batch)
+   - Stitches segment texts and timestamps back together in order
+
+6. save_transcription(prepared, transcribed, output_dir="output")
+   - Updates the transcript cache and writes the text file
+   - Writes Whisper or caption segment timing to <video_id>.segments.json when available
+
+7. transcribe_and_save(url, output_dir="output", include_segments=False)
+   - Returns the cached transcript when the video was seen before
    - Downloads audio
    - Performs transcription
    - Saves result to file
    - Returns file path and transcription text
 
+8. transcribe_stream(urls, output_dir="output", include_segments=False)
+   - Prepares audio in a thread pool and transcribes in a process pool
+   - Audio for one video is fetched while another is being transcribed
+   - Yields each segment as soon as it and the earlier segments of its video are
+     transcribed, then each finished video, while other videos are still being fetched
+   - A failing video yields an error entry without affecting the others
+
+9. transcribe_all(urls, output_dir="output", include_segments=False)
+   - Runs transcribe_stream and returns results in the same order as the URLs
+
 ## Returns
 Dictionary containing:
 - file_path: Path to saved transcription
 - transcription: Full transcription text
+- segments: Timed segments (start, end, text), only with include_segments
+- source: Where the transcript came from: "cache", "file", "captions:manual",
+  "captions:auto" or "whisper"
 - error: Error message if transcription fails
 
 ## Error Handling
@@ -65,13 +129,200 @@ Dictionary containing:
 
 
 # import dependencies
-import whisper
-import yt_dlp
+import json
+import numpy as np
 import os
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, ProcessPoolExecutor, wait
+from config import CAPTION_CONFIG, PIPELINE_CONFIG, WHISPER_CONFIG
+from transcript_cache import get_transcript, put_transcript
+from download_audio import SAMPLE_RATE, extract_info, fetch_pcm, load_pcm, remove_spooled
+from fetch_captions import fetch_captions
+from segment_audio import plan_segments
+
+# Whisper models are loaded on first use, one per (backend, model name, device, compute type)
+models = {}
+models_lock = threading.Lock()
+
+transcribe_pool = None
+transcribe_pool_lock = threading.Lock()
+segment_batcher = None
+segment_batcher_lock = threading.Lock()
+
+def load_openai_whisper(model_name, device, compute_type):
+    import whisper
+    if WHISPER_CONFIG["cpu_threads"]:
+        import torch
+        torch.set_num_threads(WHISPER_CONFIG["cpu_threads"])
+    return whisper.load_model(model_name, device=device)
+
+def run_openai_whisper(model, audio, compute_type):
+    result = model.transcribe(
+        audio,
+        fp16=compute_type == "float16",
+        beam_size=WHISPER_CONFIG["beam_size"] if WHISPER_CONFIG["beam_size"] > 1 else None
+    )
+    segments = [
+        {"start": segment["start"], "end": segment["end"], "text": segment["text"].strip()}
+        for segment in result.get("segments", [])
+    ]
+    return {"text": result["text"].strip(), "language": result.get("language"), "segments": segments}
+
+def split_timestamps(tokenizer, tokens, duration):
+    """Splits decoded tokens into timed segments at Whisper's timestamp tokens."""
+    segments = []
+    start = 0.0
+    text_tokens = []
+    for token in tokens:
+        if token >= tokenizer.timestamp_begin:
+            time_point = (token - tokenizer.timestamp_begin) * 0.02
+            if text_tokens:
+                segments.append({"start": start, "end": time_point, "text": tokenizer.decode(text_tokens).strip()})
+                text_tokens = []
+            start = time_point
+        else:
+            text_tokens.append(token)
+    if text_tokens:
+        segments.append({"start": start, "end": duration, "text": tokenizer.decode(text_tokens).strip()})
+    return [segment for segment in segments if segment["text"]]
+
+def run_openai_whisper_batch(model, audios, compute_type):
+    import torch
+    import whisper
+    from whisper.tokenizer import get_tokenizer
+
+    # One log-mel window per audio, padded to 30 seconds, encoded in a single batch
+    mels = torch.stack([
+        whisper.log_mel_spectrogram(whisper.pad_or_trim(torch.from_numpy(np.asarray(audio, dtype=np.float32))),
+                                    model.dims.n_mels)
+        for audio in audios
+    ]).to(model.device)
+    options = whisper.DecodingOptions(task="transcribe", without_timestamps=False, fp16=compute_type == "float16")
+    decoded = whisper.decode(model, mels, options)
 
-# Load Whisper model
-MODEL = whisper.load_model("base")
-# MODEL = whisper.load_model("base", weights_only=True)
+    results = []
+    for audio, result in zip(audios, decoded):
+        # Same silence check as whisper.transcribe
+        if result.no_speech_prob > 0.6 and result.avg_logprob < -1.0:
+            results.append({"text": "", "language": result.language, "segments": []})
+            continue
+        tokenizer = get_tokenizer(model.is_multilingual, num_languages=model.num_languages,
+                                  language=result.language, task="transcribe")
+        segments = split_timestamps(tokenizer, result.tokens, len(audio) / SAMPLE_RATE)
+        results.append({
+            "text": " ".join(segment["text"] for segment in segments),
+            "language": result.language,
+            "segments": segments,
+        })
+    return results
+
+def load_faster_whisper(model_name, device, compute_type):
+    from faster_whisper import WhisperModel
+    return WhisperModel(model_name, device=device, compute_type=compute_type,
+                        cpu_threads=WHISPER_CONFIG["cpu_threads"])
+
+def run_faster_whisper(model, audio, compute_type):
+    # Segments are produced lazily while decoding
+    generated, info = model.transcribe(audio, beam_size=WHISPER_CONFIG["beam_size"])
+    generated = list(generated)
+    segments = [
+        {"start": segment.start, "end": segment.end, "text": segment.text.strip()}
+        for segment in generated
+    ]
+    return {"text": "".join(segment.text for segment in generated).strip(), "language": info.language, "segments": segments}
+
+# Transcription backends: name -> (load(model_name, device, compute_type), run(model, audio, compute_type),
+# run_batch(model, audios, compute_type) or None when the backend decodes one window at a time)
+BACKENDS = {
+    "openai": (load_openai_whisper, run_openai_whisper, run_openai_whisper_batch),
+    "faster-whisper": (load_faster_whisper, run_faster_whisper, None),
+}
+
+def get_model(model_name=None, device=None, compute_type=None, backend=None):
+    """
+    Returns a shared Whisper model, loading it on first use.
+    Args:
+        model_name (str): Whisper model size, defaults to WHISPER_CONFIG["model_name"].
+        device (str): Device, defaults to WHISPER_CONFIG["device"].
+        compute_type (str): e.g. "float32", "float16" or "int8", defaults to WHISPER_CONFIG["compute_type"].
+        backend (str): Key of BACKENDS, defaults to WHISPER_CONFIG["backend"].
+    Returns:
+        object: Loaded model of the backend.
+    """
+    key = (
+        backend or WHISPER_CONFIG["backend"],
+        model_name or WHISPER_CONFIG["model_name"],
+        device or WHISPER_CONFIG["device"],
+        compute_type or WHISPER_CONFIG["compute_type"],
+    )
+
+    model = models.get(key)
+    if model is None:
+        with models_lock:
+            model = models.get(key)
+            if model is None:
+                model = BACKENDS[key[0]][0](*key[1:])
+                models[key] = model
+    return model
+
+def run_model(audio, backend=None, compute_type=None):
+    """
+    Transcribes audio with a backend (WHISPER_CONFIG by default).
+    Args:
+        audio (numpy.ndarray): 16 kHz mono float32 samples.
+        backend (str): Key of BACKENDS.
+        compute_type (str): Compute type of the model.
+    Returns:
+        dict: Contains text, detected language and segments with start and end
+        in seconds relative to the start of the audio.
+    """
+    backend = backend or WHISPER_CONFIG["backend"]
+    compute_type = compute_type or WHISPER_CONFIG["compute_type"]
+    model = get_model(compute_type=compute_type, backend=backend)
+    return BACKENDS[backend][1](model, audio, compute_type)
+
+def run_model_batch(audios, backend=None, compute_type=None):
+    """
+    Transcribes several audio windows of at most 30 seconds together.
+    Args:
+        audios (list): 16 kHz mono float32 sample arrays.
+        backend (str): Key of BACKENDS.
+        compute_type (str): Compute type of the model.
+    Returns:
+        list: One run_model style result per window, in the same order.
+    """
+    backend = backend or WHISPER_CONFIG["backend"]
+    compute_type = compute_type or WHISPER_CONFIG["compute_type"]
+    run_batch = BACKENDS[backend][2]
+    if run_batch is None:
+        return [run_model(audio, backend, compute_type) for audio in audios]
+    return run_batch(get_model(compute_type=compute_type, backend=backend), audios, compute_type)
+
+def preload_model():
+    """
+    Loads the configured Whisper model and runs it once on a second of silence,
+    so the first real request does not pay for loading and warmup.
+    """
+    run_model(np.zeros(SAMPLE_RATE, dtype=np.float32))
+
+def get_model_id():
+    """Identifies the configured Whisper model, so cached transcripts of another model are not reused."""
+    return f"whisper:{WHISPER_CONFIG['backend']}:{WHISPER_CONFIG['model_name']}:{WHISPER_CONFIG['compute_type']}"
+
+def get_accepted_models():
+    """
+    Returns the model IDs whose cached transcripts may be served, most preferred first:
+    manual captions, the configured Whisper model, then automatic captions (caption
+    sources only while CAPTION_CONFIG allows them).
+    """
+    models = [get_model_id()]
+    if CAPTION_CONFIG["enabled"]:
+        models.insert(0, "captions:manual")
+        if CAPTION_CONFIG["allow_auto"]:
+            models.append("captions:auto")
+    return models
 
 def extract_video_id(url):
     """
@@ -87,38 +338,460 @@ def extract_video_id(url):
         return url.split("youtu.be/")[-1]
     return "unknown_video_id"
 
-def transcribe_and_save(url, output_dir="output"):
+def read_previous_transcript(video_id, output_dir="output", processed_dir="processed"):
+    """
+    Reads a transcript left on disk by an earlier run.
+    Args:
+        video_id (str): YouTube video ID.
+        output_dir (str): Directory of transcripts waiting to be embedded.
+        processed_dir (str): Directory of transcripts already embedded.
+    Returns:
+        str: Transcription text, or None if no file exists.
+    """
+    for directory in (output_dir, processed_dir):
+        file_path = os.path.join(directory, f"{video_id}.txt")
+        if os.path.isfile(file_path):
+            with open(file_path, "r", encoding="utf-8") as file:
+                return file.read()
+    return None
+
+def prepare_audio(url, output_dir="output"):
+    """
+    Resolves a video to either a known transcript or decoded local audio.
+    This is the I/O-bound stage of the pipeline.
+    Args:
+        url (str): YouTube video URL.
+        output_dir (str): Directory checked for earlier transcripts.
+    Returns:
+        dict: Contains video_id and either transcription (with cached flag and
+        source) or audio (path to the decoded .pcm file).
+    """
+    video_id = extract_video_id(url)
+
+    # Reuse an earlier transcription of the same video when available
+    cached = get_transcript(video_id, get_accepted_models())
+    if cached is not None:
+        return {"video_id": video_id, "transcription": cached["transcription"], "cached": True, "source": "cache"}
+
+    transcription = read_previous_transcript(video_id, output_dir)
+    if transcription is not None:
+        return {"video_id": video_id, "transcription": transcription, "cached": False, "source": "file"}
+
+    # Existing captions avoid downloading and transcribing the audio. The metadata looked
+    # up for them is reused by the download, so yt-dlp only extracts the video once.
+    info = None
+    if CAPTION_CONFIG["enabled"]:
+        info = extract_info(url)
+        captions = fetch_captions(url, info)
+        if captions is not None:
+            return {"video_id": video_id, "cached": False, "model": captions["source"], **captions}
+
+    # Download audio with yt-dlp and decode it to local PCM
+    return {"video_id": video_id, "audio": fetch_pcm(url, video_id, info)}
+
+def transcribe_segment(pcm_path, start, end):
+    """
+    Runs Whisper on one segment of decoded audio. This is the CPU-bound stage of
+    the pipeline and runs in a worker process holding its own model.
+    Args:
+        pcm_path (str): Path to a decoded .pcm file.
+        start (int): First sample of the segment.
+        end (int): Sample after the last one in the segment.
+    Returns:
+        dict: Contains text, detected language and timed segments in seconds
+        relative to the start of the video.
+    """
+    audio = np.array(load_pcm(pcm_path)[start:end])
+    offset = start / SAMPLE_RATE
+
+    result = run_model(audio)
+    segments = [
+        {"start": offset + segment["start"], "end": offset + segment["end"], "text": segment["text"]}
+        for segment in result["segments"]
+    ]
+    return {"text": result["text"], "language": result["language"], "segments": segments}
+
+def transcribe_batch(windows):
+    """
+    Runs Whisper on a batch of audio segments, possibly from different videos,
+    in one worker process.
+    Args:
+        windows (list): (pcm_path, start, end) tuples of at most 30 seconds each.
+    Returns:
+        list: One transcribe_segment style result per window, in the same order.
+    """
+    audios = [np.array(load_pcm(pcm_path)[start:end]) for pcm_path, start, end in windows]
+
+    results = []
+    for (pcm_path, start, end), result in zip(windows, run_model_batch(audios)):
+        offset = start / SAMPLE_RATE
+        segments = [
+            {"start": offset + segment["start"], "end": offset + segment["end"], "text": segment["text"]}
+            for segment in result["segments"]
+        ]
+        results.append({"text": result["text"], "language": result["language"], "segments": segments})
+    return results
+
+class SegmentBatcher:
+    """
+    Collects segments submitted by every transcription in this process and sends
+    them to the transcription pool in batches of up to batch_size, waiting at most
+    batch_wait_ms for a batch to fill. If the pool stops accepting work (e.g. a
+    worker crashed and broke it), every queued segment fails and so does every
+    later submit.
+    """
+
+    def __init__(self, pool, batch_size, wait_seconds):
+        self.pool = pool
+        self.batch_size = batch_size
+        self.wait_seconds = wait_seconds
+        self.pending = queue.Queue()
+        self.error = None
+        self.error_lock = threading.Lock()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, pcm_path, start, end):
+        """Queues one segment and returns a future of its transcribe_segment style result."""
+        future = Future()
+        # Checked under the lock, so a segment is never queued after the queue was failed
+        with self.error_lock:
+            if self.error is not None or not self.thread.is_alive():
+                raise RuntimeError(f"Segment batcher stopped: {self.error}")
+            self.pending.put(((pcm_path, start, end), future))
+        return future
+
+    def run(self):
+        batch = []
+        try:
+            while True:
+                batch = [self.pending.get()]
+                deadline = time.monotonic() + self.wait_seconds
+                while len(batch) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self.pending.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+
+                windows = [window for window, _ in batch]
+                futures = [future for _, future in batch]
+                self.pool.submit(transcribe_batch, windows).add_done_callback(
+                    lambda done, futures=futures: self.resolve(done, futures)
+                )
+                batch = []
+        except Exception as e:
+            self.fail(batch, e)
+
+    def fail(self, batch, error):
+        """Stops accepting segments and fails the current batch and everything still queued."""
+        with self.error_lock:
+            self.error = error
+        while True:
+            try:
+                batch.append(self.pending.get_nowait())
+            except queue.Empty:
+                break
+        for _, future in batch:
+            future.set_exception(error)
+
+    @staticmethod
+    def resolve(done, futures):
+        """Hands each segment its result from a finished batch."""
+        if done.exception() is not None:
+            for future in futures:
+                future.set_exception(done.exception())
+            return
+        for future, result in zip(futures, done.result()):
+            future.set_result(result)
+
+def get_segment_batcher():
+    """
+    Returns the shared segment batcher, or None when batching is disabled.
+    """
+    global segment_batcher
+    if WHISPER_CONFIG["batch_size"] <= 1:
+        return None
+    with segment_batcher_lock:
+        if segment_batcher is None:
+            segment_batcher = SegmentBatcher(
+                get_transcribe_pool(),
+                WHISPER_CONFIG["batch_size"],
+                WHISPER_CONFIG["batch_wait_ms"] / 1000
+            )
+    return segment_batcher
+
+def submit_segments(pcm_path):
+    """
+    Splits decoded audio into speech segments and queues each one on the
+    transcription pool.
+    Args:
+        pcm_path (str): Path to a decoded .pcm file.
+    Returns:
+        list: Futures of transcribe_segment results, in time order.
+    """
+    batcher = get_segment_batcher()
+    if batcher is not None:
+        return [batcher.submit(pcm_path, start, end) for start, end in plan_segments(load_pcm(pcm_path))]
+
+    pool = get_transcribe_pool()
+    return [
+        pool.submit(transcribe_segment, pcm_path, start, end)
+        for start, end in plan_segments(load_pcm(pcm_path))
+    ]
+
+def stitch_segments(parts):
+    """
+    Joins segment transcriptions back together in order.
+    Args:
+        parts (list): transcribe_segment results, in time order.
+    Returns:
+        dict: Contains transcription text, detected language, model name and
+        timed segments.
+    """
+    languages = [part["language"] for part in parts if part["language"]]
+    language = max(set(languages), key=languages.count) if languages else None
+
+    return {
+        "transcription": " ".join(part["text"] for part in parts if part["text"]),
+        "language": language,
+        "model": get_model_id(),
+        "segments": [segment for part in parts for segment in part["segments"]],
+    }
+
+def collect_segments(futures):
+    """
+    Waits for segment transcriptions and stitches them back together in order.
+    Args:
+        futures (list): Futures returned by submit_segments.
+    Returns:
+        dict: Result of stitch_segments.
+    """
+    return stitch_segments([future.result() for future in futures])
+
+def transcribe_audio(pcm_path):
+    """
+    Transcribes decoded audio, decoding its speech segments in parallel.
+    Args:
+        pcm_path (str): Path to a decoded .pcm file.
+    Returns:
+        dict: Contains transcription text, detected language, model name and
+        timed segments.
+    """
+    return collect_segments(submit_segments(pcm_path))
+
+def save_transcription(prepared, transcribed=None, output_dir="output"):
+    """
+    Records a transcription in the cache and writes it to the output directory.
+    The caller releases the spooled audio of prepared.
+    Args:
+        prepared (dict): Result of prepare_audio.
+        transcribed (dict): Result of transcribe_audio, if Whisper was run.
+        output_dir (str): Directory to save the transcription.
+    Returns:
+        dict: Contains the file path, transcription text and source.
+    """
+    video_id = prepared["video_id"]
+
+    if transcribed is not None:
+        transcription = transcribed["transcription"]
+        segments = transcribed["segments"]
+        source = "whisper"
+        put_transcript(video_id, transcription, model=transcribed["model"], language=transcribed["language"])
+    else:
+        transcription = prepared["transcription"]
+        segments = prepared.get("segments")
+        source = prepared["source"]
+        # Transcripts read back from files carry no model ID and stay on disk anyway
+        if not prepared["cached"] and prepared.get("model"):
+            put_transcript(video_id, transcription, model=prepared.get("model"), language=prepared.get("language"))
+
+    # Create output directory if it doesn't exist
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Use video ID as file name
+    file_path = os.path.join(output_dir, f"{video_id}.txt")
+    
+    # Save transcription to a file
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.write(transcription)
+
+    # Keep segment timing next to the transcript so passages can be timestamped
+    if segments:
+        with open(os.path.join(output_dir, f"{video_id}.segments.json"), "w", encoding="utf-8") as file:
+            json.dump(segments, file)
+
+    return {"file_path": file_path, "transcription": transcription, "source": source}
+
+def add_segments(result, transcribed, prepared=None):
+    """
+    Adds per-segment timing to a transcription result. Transcripts reused from
+    the cache carry no timing, so their segment list is empty.
+    """
+    if transcribed is not None:
+        result["segments"] = transcribed["segments"]
+    else:
+        result["segments"] = (prepared or {}).get("segments") or []
+    return result
+
+def transcribe_and_save(url, output_dir="output", include_segments=False):
     """
     Transcribe audio from a YouTube video and save it to a file.
     Args:
         url (str): YouTube video URL.
         output_dir (str): Directory to save the transcription.
+        include_segments (bool): Also return timed segments.
     Returns:
-        dict: Contains the file path and transcription text.
+        dict: Contains the file path and transcription text, plus segments
+        when include_segments is set.
     """
+    prepared = None
+    saved = False
     try:
-        # Download audio with yt-dlp
-        with yt_dlp.YoutubeDL({'format': 'bestaudio'}) as ydl:
-            info = ydl.extract_info(url, download=False)
-            audio_url = info['url']
-        
-        # Transcribe audio
-        result = MODEL.transcribe(audio_url)
-        transcription = result['text']
-
-        # Create output directory if it doesn't exist
-        os.makedirs(output_dir, exist_ok=True)
-
-        # Use video ID as file name
-        video_id = extract_video_id(url)
-        file_path = os.path.join(output_dir, f"{video_id}.txt")
-        
-        # Save transcription to a file
-        with open(file_path, "w", encoding="utf-8") as file:
-            file.write(transcription)
-
-        return {"file_path": file_path, "transcription": transcription}
+        prepared = prepare_audio(url, output_dir)
+
+        transcribed = None
+        if "audio" in prepared:
+            transcribed = transcribe_audio(prepared["audio"])
+
+        result = save_transcription(prepared, transcribed, output_dir)
+        saved = True
+        if include_segments:
+            add_segments(result, transcribed, prepared)
+        return result
 
     except Exception as e:
         return {"error": f"Transcription failed: {str(e)}"}
 
+    finally:
+        # Release the spooled audio exactly once, keeping it for a retry unless saved
+        if prepared is not None and "audio" in prepared:
+            remove_spooled(prepared["video_id"], delete=saved)
+
+def get_transcribe_pool():
+    """
+    Returns the shared process pool used for Whisper inference.
+    """
+    global transcribe_pool
+    with transcribe_pool_lock:
+        if transcribe_pool is None:
+            initializer = preload_model if WHISPER_CONFIG["preload"] else None
+            transcribe_pool = ProcessPoolExecutor(
+                max_workers=PIPELINE_CONFIG["transcribe_workers"],
+                initializer=initializer
+            )
+    return transcribe_pool
+
+def start_transcribe_pool():
+    """
+    Creates the transcription pool and starts all of its worker processes, which load
+    the model in their initializer (preload_model) when WHISPER_CONFIG["preload"] is set.
+    Call at startup, before the server process loads any model itself.
+    """
+    pool = get_transcribe_pool()
+    # Submitted together, before any worker is idle, so each one starts its own process
+    wait([pool.submit(os.getpid) for _ in range(PIPELINE_CONFIG["transcribe_workers"])])
+
+def transcribe_stream(urls, output_dir="output", include_segments=False):
+    """
+    Transcribe several videos, overlapping audio preparation for one video with
+    Whisper inference for another, and report progress as it happens.
+    Args:
+        urls (list): YouTube video URLs in rank order.
+        output_dir (str): Directory to save the transcriptions.
+        include_segments (bool): Also return timed segments in finished results.
+    Yields:
+        tuple: (event, index, payload) where index is the URL position and event is
+        - "segment": payload is a transcribe_segment result, yielded in time order
+        - "done": payload is the transcribe_and_save style result for the video
+    """
+    # Futures being waited on: prepare_audio futures, and for each video being
+    # transcribed only its next segment, so segments are yielded in time order
+    waiting = {}
+    videos = {}
+
+    def finish(index):
+        # Videos leave `videos` exactly once, here or on error, releasing their spooled audio
+        prepared, futures, parts = videos.pop(index)
+        saved = False
+        try:
+            transcribed = stitch_segments(parts)
+            result = save_transcription(prepared, transcribed, output_dir)
+            saved = True
+        finally:
+            remove_spooled(prepared["video_id"], delete=saved)
+        if include_segments:
+            add_segments(result, transcribed)
+        return result
+
+    download_pool = ThreadPoolExecutor(max_workers=PIPELINE_CONFIG["download_workers"])
+    try:
+        for index, url in enumerate(urls):
+            waiting[download_pool.submit(prepare_audio, url, output_dir)] = ("prepare", index)
+
+        while waiting:
+            done, _ = wait(waiting, return_when=FIRST_COMPLETED)
+            for future in done:
+                kind, index = waiting.pop(future)
+                try:
+                    if kind == "prepare":
+                        prepared = future.result()
+                        if "audio" not in prepared:
+                            result = save_transcription(prepared, output_dir=output_dir)
+                            if include_segments:
+                                add_segments(result, None, prepared)
+                            yield "done", index, result
+                            continue
+                        # Hand the video to the inference pool as soon as its audio is ready;
+                        # registered first so its audio is released even if queueing fails
+                        videos[index] = (prepared, [], [])
+                        videos[index][1].extend(submit_segments(prepared["audio"]))
+                    else:
+                        prepared, futures, parts = videos[index]
+                        # Later segments of the video may already be done as well
+                        while len(parts) < len(futures) and futures[len(parts)].done():
+                            parts.append(futures[len(parts)].result())
+                            yield "segment", index, parts[-1]
+
+                    prepared, futures, parts = videos[index]
+                    if len(parts) < len(futures):
+                        waiting[futures[len(parts)]] = ("segment", index)
+                        continue
+                    result = finish(index)
+                except Exception as e:
+                    video = videos.pop(index, None)
+                    if video is not None:
+                        remove_spooled(video[0]["video_id"], delete=False)
+                    result = {"error": f"Transcription failed: {str(e)}"}
+                yield "done", index, result
+
+    finally:
+        # Stopped early (e.g. the caller closed the stream): release audio still held
+        for future, (kind, index) in waiting.items():
+            if kind == "prepare":
+                future.cancel()
+        download_pool.shutdown()
+        for future, (kind, index) in waiting.items():
+            if kind == "prepare" and not future.cancelled() and future.exception() is None:
+                if "audio" in future.result():
+                    remove_spooled(future.result()["video_id"], delete=False)
+        for prepared, futures, parts in videos.values():
+            remove_spooled(prepared["video_id"], delete=False)
+
+def transcribe_all(urls, output_dir="output", include_segments=False):
+    """
+    Transcribe several videos concurrently (see transcribe_stream).
+    Args:
+        urls (list): YouTube video URLs in rank order.
+        output_dir (str): Directory to save the transcriptions.
+        include_segments (bool): Also return timed segments.
+    Returns:
+        list: One transcribe_and_save style dictionary per URL, in the same order.
+    """
+    results = [None] * len(urls)
+    for event, index, payload in transcribe_stream(urls, output_dir, include_segments):
+        if event == "done":
+            results[index] = payload
+    return results
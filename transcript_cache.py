@@ -0,0 +1,209 @@
+"""
+# Transcript Cache Module
+
+This module stores finished transcriptions keyed by YouTube video ID and the model that
+produced them, so repeated topics do not re-run yt-dlp extraction and Whisper for videos
+that were already transcribed, and changing the model never serves an older model's text.
+
+## Summary
+- Persists transcripts in a single SQLite file (primary-key lookups by video ID and model)
+- Records the model ID (Whisper backend, size and compute type, or caption source),
+  detected language and creation time for each entry
+- Safe to share between processes (WAL journal, busy timeout) and threads (one
+  connection per thread)
+- Evicts entries by age, entry count and total transcript size every EVICT_EVERY
+  inserts, walking an index on last access time
+
+## Dependencies
+
+### System Requirements
+- Python 3.8+
+- SQLite (bundled with Python)
+
+### Package Dependencies
+No additional package installations required beyond project dependencies
+
+### Project Dependencies
+1. config.py
+   - Provides TRANSCRIPT_CACHE_CONFIG with:
+     - path
+     - max_entries
+     - max_bytes
+     - max_age_days
+
+## Functions
+1. get_transcript(video_id, models)
+   - Returns the cached entry for a video produced by one of models, or None
+   - Refreshes the entry's last access time
+
+2. put_transcript(video_id, transcription, model, language)
+   - Inserts or replaces an entry and runs eviction
+
+3. evict()
+   - Drops expired entries, then least recently used ones over the limits
+
+## Returns
+Cache entries are dictionaries containing:
+- video_id: YouTube video ID
+- transcription: Full transcription text
+- model: ID of the model or caption source that produced it
+- language: Detected language code
+- created_at: Unix timestamp of the transcription
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from config import TRANSCRIPT_CACHE_CONFIG
+
+# Entries are keyed by (video_id, model); the table of video-only keys is dropped
+SCHEMA = """
+DROP TABLE IF EXISTS transcripts;
+CREATE TABLE IF NOT EXISTS model_transcripts (
+    video_id TEXT NOT NULL,
+    model TEXT NOT NULL,
+    transcription TEXT NOT NULL,
+    language TEXT,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (video_id, model)
+);
+CREATE INDEX IF NOT EXISTS model_transcripts_last_access ON model_transcripts (last_access);
+CREATE INDEX IF NOT EXISTS model_transcripts_created_at ON model_transcripts (created_at);
+"""
+
+# Eviction runs after this many inserts in a process
+EVICT_EVERY = 50
+
+connections = threading.local()
+inserts = 0
+inserts_lock = threading.Lock()
+
+def get_connection(path=None):
+    """
+    Returns this thread's connection to the cache database, opening it (and creating
+    the file) on first use.
+    Args:
+        path (str): Database file, defaults to TRANSCRIPT_CACHE_CONFIG["path"].
+    Returns:
+        sqlite3.Connection: Connection in autocommit mode.
+    """
+    path = path or TRANSCRIPT_CACHE_CONFIG["path"]
+    opened = getattr(connections, "opened", None)
+    if opened is None:
+        opened = connections.opened = {}
+
+    connection = opened.get(path)
+    if connection is None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SCHEMA)
+        opened[path] = connection
+    return connection
+
+def get_transcript(video_id, models, path=None):
+    """
+    Looks up a cached transcript.
+    Args:
+        video_id (str): YouTube video ID.
+        models (list): Model IDs whose transcripts are acceptable, most preferred first.
+        path (str): Optional database file.
+    Returns:
+        dict: Cache entry, or None if missing or expired.
+    """
+    if not models:
+        return None
+
+    max_age = TRANSCRIPT_CACHE_CONFIG["max_age_days"] * 86400
+    now = time.time()
+
+    connection = get_connection(path)
+    rows = connection.execute(
+        "SELECT video_id, transcription, model, language, created_at FROM model_transcripts "
+        f"WHERE video_id = ? AND model IN ({', '.join('?' for _ in models)}) AND created_at >= ?",
+        (video_id, *models, now - max_age)
+    ).fetchall()
+    if not rows:
+        return None
+
+    row = min(rows, key=lambda row: models.index(row[2]))
+    connection.execute(
+        "UPDATE model_transcripts SET last_access = ? WHERE video_id = ? AND model = ?",
+        (now, video_id, row[2])
+    )
+
+    return {
+        "video_id": row[0],
+        "transcription": row[1],
+        "model": row[2],
+        "language": row[3],
+        "created_at": row[4],
+    }
+
+def put_transcript(video_id, transcription, model, language=None, path=None):
+    """
+    Stores a transcript, replacing any previous entry for the video and model.
+    Args:
+        video_id (str): YouTube video ID.
+        transcription (str): Full transcription text.
+        model (str): ID of the model or caption source that produced it.
+        language (str): Detected language code.
+        path (str): Optional database file.
+    """
+    global inserts
+    now = time.time()
+
+    connection = get_connection(path)
+    connection.execute(
+        "INSERT OR REPLACE INTO model_transcripts "
+        "(video_id, model, transcription, language, created_at, last_access, size) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (video_id, model, transcription, language, now, now, len(transcription.encode("utf-8")))
+    )
+
+    with inserts_lock:
+        inserts += 1
+        due = inserts >= EVICT_EVERY
+        if due:
+            inserts = 0
+    if due:
+        evict(connection)
+
+def evict(connection=None):
+    """
+    Removes expired entries, then the least recently used entries beyond
+    the configured entry count and total size.
+    Args:
+        connection (sqlite3.Connection): Optional open connection to reuse.
+    """
+    connection = connection or get_connection()
+
+    max_age = TRANSCRIPT_CACHE_CONFIG["max_age_days"] * 86400
+    connection.execute(
+        "DELETE FROM model_transcripts WHERE created_at < ?",
+        (time.time() - max_age,)
+    )
+
+    # Both limits walk the last_access index from the oldest entry, reading only what is removed
+    count, size = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM model_transcripts").fetchone()
+    excess_count = count - TRANSCRIPT_CACHE_CONFIG["max_entries"]
+    excess_size = size - TRANSCRIPT_CACHE_CONFIG["max_bytes"]
+    if excess_count <= 0 and excess_size <= 0:
+        return
+
+    oldest = []
+    cursor = connection.execute("SELECT rowid, size FROM model_transcripts ORDER BY last_access ASC")
+    for rowid, entry_size in cursor:
+        if len(oldest) >= excess_count and excess_size <= 0:
+            break
+        oldest.append((rowid,))
+        excess_size -= entry_size
+    cursor.close()
+
+    connection.executemany("DELETE FROM model_transcripts WHERE rowid = ?", oldest)